@@ -1,5 +1,7 @@
 # analyzer/charts.py
-import matplotlib.pyplot as plt
+# API de Figure (sin pyplot): pyplot no es seguro entre hilos y los informes
+# se generan en los hilos de la cola de la UI.
+from matplotlib.figure import Figure
 import numpy as np
 import matplotlib.dates as mdates
 
@@ -8,6 +10,7 @@ def grafica_temp(df, col_ts, col_temp, out_png, titulo, umbral=None):
     """
     Gráfico SOLO de temperatura.
     - Línea roja de la temperatura.
+    - Línea morada del WBGT aproximado (si existe la columna wbgt_c).
     - Línea horizontal del umbral (si se indica).
     - Zona superior al umbral coloreada.
     - Eje X con solo las horas (HH:MM).
@@ -15,26 +18,30 @@ def grafica_temp(df, col_ts, col_temp, out_png, titulo, umbral=None):
     x = df[col_ts]
     y = df[col_temp]
 
-    plt.figure()
-    plt.plot(x, y, label="Temperatura (°C)", color="red")
+    fig = Figure()
+    ax = fig.subplots()
+    ax.plot(x, y, label="Temperatura (°C)", color="red")
+
+    # WBGT aproximado (analyzer.thermal), si se ha calculado al cargar
+    if "wbgt_c" in df.columns and df["wbgt_c"].notna().any():
+        ax.plot(x, df["wbgt_c"], label="WBGT aprox. (°C)", color="purple", linewidth=0.9)
 
     # Línea del umbral
     if umbral is not None:
-        plt.axhline(umbral, linestyle="--", linewidth=1.2, color="orange", label=f"Umbral {umbral} °C")
+        ax.axhline(umbral, linestyle="--", linewidth=1.2, color="orange", label=f"Umbral {umbral} °C")
         y2 = np.array(y, dtype=float)
-        plt.fill_between(x, y2, umbral, where=y2 >= umbral, alpha=0.25, color="red")
+        ax.fill_between(x, y2, umbral, where=y2 >= umbral, alpha=0.25, color="red")
 
     # --- Formato del eje X: solo hora ---
-    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
-    plt.xticks(rotation=45)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
+    ax.tick_params(axis="x", labelrotation=45)
 
-    plt.title(titulo)
-    plt.xlabel("Hora del día")
-    plt.ylabel("Temperatura (°C)")
-    plt.tight_layout()
-    plt.legend()
-    plt.savefig(out_png)
-    plt.close()
+    ax.set_title(titulo)
+    ax.set_xlabel("Hora del día")
+    ax.set_ylabel("Temperatura (°C)")
+    fig.tight_layout()
+    ax.legend()
+    fig.savefig(out_png)
 
 
 def grafica_hum(df, col_ts, col_hum, out_png, titulo):
@@ -48,18 +55,18 @@ def grafica_hum(df, col_ts, col_hum, out_png, titulo):
     x = df[col_ts]
     y = df[col_hum]
 
-    plt.figure()
-    plt.plot(x, y, label="Humedad (%)", color="blue")
+    fig = Figure()
+    ax = fig.subplots()
+    ax.plot(x, y, label="Humedad (%)", color="blue")
 
     # --- Formato del eje X: solo hora ---
-    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
-    plt.xticks(rotation=45)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
+    ax.tick_params(axis="x", labelrotation=45)
 
-    plt.title(titulo)
-    plt.xlabel("Hora del día")
-    plt.ylabel("Humedad (%)")
-    plt.tight_layout()
-    plt.legend()
-    plt.savefig(out_png)
-    plt.close()
+    ax.set_title(titulo)
+    ax.set_xlabel("Hora del día")
+    ax.set_ylabel("Humedad (%)")
+    fig.tight_layout()
+    ax.legend()
+    fig.savefig(out_png)
     return out_png
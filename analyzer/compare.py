@@ -0,0 +1,130 @@
+# analyzer/compare.py
+import numpy as np
+import pandas as pd
+
+
+def alinear_estaciones(series, col_ts="timestamp", col_valor="temp_c", freq="10min"):
+    """
+    Alinea N estaciones sobre una rejilla temporal común.
+    - series: dict {nombre_estacion: DataFrame}
+    Devuelve un DataFrame ancho (índice = rejilla, columnas = estaciones) con
+    la media de cada celda; NaN donde una estación no tiene lecturas.
+    Todo se hace con un único groupby, sin bucles por estación.
+    """
+    series = {k: v for k, v in series.items() if v is not None and not v.empty}
+    if not series:
+        return pd.DataFrame()
+
+    largo = pd.concat(
+        [v[[col_ts, col_valor]] for v in series.values()],
+        keys=list(series.keys()),
+        names=["estacion", None],
+    ).reset_index(level="estacion")
+    largo["celda"] = largo[col_ts].dt.floor(freq)
+
+    ancho = (
+        largo.groupby(["celda", "estacion"], sort=True)[col_valor]
+        .mean()
+        .unstack("estacion")
+        .reindex(columns=list(series.keys()))
+    )
+    rejilla = pd.date_range(ancho.index.min(), ancho.index.max(), freq=freq)
+    ancho = ancho.reindex(rejilla)
+    ancho.index.name = col_ts
+    return ancho.astype(float)
+
+
+def estadisticas_por_estacion(matriz, umbral, intervalo_min=10):
+    """
+    Estadísticas por estación sobre la matriz alineada (una fila por estación):
+    media, máx, mín, cobertura (% de celdas con dato) y minutos ≥ umbral.
+    """
+    m = matriz.to_numpy(dtype=float)
+    valido = ~np.isnan(m)
+    n_validos = valido.sum(axis=0)
+    with np.errstate(invalid="ignore"):
+        sobre = (m >= float(umbral)).sum(axis=0)
+    vacias = n_validos == 0
+    m_seguro = np.where(valido, m, 0.0)
+
+    media = np.divide(m_seguro.sum(axis=0), n_validos, out=np.full(m.shape[1], np.nan), where=~vacias)
+    maximo = np.where(valido, m, -np.inf).max(axis=0, initial=-np.inf)
+    minimo = np.where(valido, m, np.inf).min(axis=0, initial=np.inf)
+
+    return pd.DataFrame(
+        {
+            "temp_media": np.round(media, 1),
+            "temp_max": np.round(np.where(vacias, np.nan, maximo), 1),
+            "temp_min": np.round(np.where(vacias, np.nan, minimo), 1),
+            "cobertura_pct": np.round(100.0 * n_validos / max(len(m), 1), 1),
+            "minutos_sobre_umbral": (sobre * intervalo_min).astype(int),
+        },
+        index=pd.Index(matriz.columns, name="estacion"),
+    )
+
+
+def comparativa_temporal(matriz, umbral, freq="1h"):
+    """
+    Estadísticas entre estaciones por intervalo (por defecto, por hora):
+    - estacion_mas_caliente: la de mayor media en el intervalo
+    - temp_max / temp_min / dispersion (máx - mín) / desviacion entre estaciones
+      (sobre las medias del intervalo)
+    - estaciones_sobre_umbral: máximo de estaciones ≥ umbral en una misma celda
+      de la rejilla dentro del intervalo (las excedencias cortas no se diluyen)
+    - estaciones_con_dato
+    """
+    if matriz.empty:
+        return pd.DataFrame()
+
+    agregada = matriz.resample(freq).mean()
+    m = agregada.to_numpy(dtype=float)
+    valido = ~np.isnan(m)
+    con_dato = valido.any(axis=1)
+
+    idx_max = np.argmax(np.where(valido, m, -np.inf), axis=1)
+    nombres = np.asarray(agregada.columns, dtype=object)
+    mas_caliente = np.where(con_dato, nombres[idx_max], None)
+
+    n = valido.sum(axis=1)
+    m_seguro = np.where(valido, m, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tmax = np.where(con_dato, np.where(valido, m, -np.inf).max(axis=1), np.nan)
+        tmin = np.where(con_dato, np.where(valido, m, np.inf).min(axis=1), np.nan)
+        media = m_seguro.sum(axis=1) / n
+        desv = np.sqrt((np.where(valido, m - media[:, None], 0.0) ** 2).sum(axis=1) / n)
+
+    # Simultaneidad a la resolución de la rejilla, y luego el máximo por intervalo
+    with np.errstate(invalid="ignore"):
+        sobre_celda = (matriz.to_numpy(dtype=float) >= float(umbral)).sum(axis=1)
+    sobre = (
+        pd.Series(sobre_celda, index=matriz.index).resample(freq).max()
+        .reindex(agregada.index, fill_value=0)
+    )
+
+    return pd.DataFrame(
+        {
+            "estacion_mas_caliente": mas_caliente,
+            "temp_max": np.round(tmax, 1),
+            "temp_min": np.round(tmin, 1),
+            "dispersion": np.round(tmax - tmin, 1),
+            "desviacion": np.round(desv, 2),
+            "estaciones_sobre_umbral": sobre.to_numpy().astype(int),
+            "estaciones_con_dato": n.astype(int),
+        },
+        index=agregada.index,
+    )
+
+
+def resumen_comparativa(comparativa):
+    """Cifras globales de la comparativa para tablas y PDF."""
+    if comparativa.empty:
+        return {}
+    mas_caliente = comparativa["estacion_mas_caliente"].dropna()
+    return {
+        "intervalos": int(len(comparativa)),
+        "dispersion_media": round(float(comparativa["dispersion"].mean()), 1),
+        "dispersion_max": round(float(comparativa["dispersion"].max()), 1),
+        "max_simultaneas_sobre_umbral": int(comparativa["estaciones_sobre_umbral"].max()),
+        "intervalos_con_excedencia": int((comparativa["estaciones_sobre_umbral"] > 0).sum()),
+        "veces_mas_caliente": mas_caliente.value_counts().to_dict(),
+    }
@@ -0,0 +1,122 @@
+# analyzer/daily.py
+import pandas as pd
+
+
+def franja_mas_caliente(df, col_ts, col_temp, ventana_horas=2):
+    ds = df.set_index(col_ts).sort_index()
+    roll = ds[col_temp].rolling(f"{ventana_horas}h").mean()
+    idxmax = roll.idxmax()
+    if pd.isna(idxmax):
+        return None
+    t_fin = idxmax
+    t_ini = t_fin - pd.Timedelta(hours=ventana_horas)
+    return {"inicio": t_ini, "fin": t_fin, "temp_media_franja": round(float(roll.loc[idxmax]), 1)}
+
+
+def intervalos_sobre_umbral(df, col_ts, col_temp, umbral):
+    df = df.sort_values(col_ts).reset_index(drop=True).copy()
+    s = (df[col_temp] >= float(umbral))  # incluye 30.0 exactos
+
+    starts = df.loc[s & ~s.shift(fill_value=False), col_ts].reset_index(drop=True)
+    ends = df.loc[~s & s.shift(fill_value=False), col_ts].reset_index(drop=True)
+    if len(ends) < len(starts):
+        ends = pd.concat([ends, pd.Series([df[col_ts].iloc[-1]])], ignore_index=True)
+
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def resumen_basico(df, col_temp, col_hum):
+    res = {
+        "n": int(len(df)),
+        "temp_media": round(float(df[col_temp].mean()), 1) if len(df) else None,
+        "temp_max": round(float(df[col_temp].max()), 1) if len(df) else None,
+        "temp_min": round(float(df[col_temp].min()), 1) if len(df) else None,
+    }
+    if col_hum in df.columns and df[col_hum].notna().any():
+        res["hum_media"] = round(float(df[col_hum].mean()), 1)
+    else:
+        res["hum_media"] = None
+
+    # Métricas derivadas (analyzer.thermal), ya calculadas al cargar
+    for col, clave, agg in (
+        ("punto_rocio_c", "punto_rocio_media", "mean"),
+        ("indice_calor_c", "indice_calor_max", "max"),
+        ("wbgt_c", "wbgt_max", "max"),
+    ):
+        if col in df.columns:
+            valor = df[col].agg(agg)
+            res[clave] = None if pd.isna(valor) else round(float(valor), 1)
+    return res
+
+
+def _paso_minutos(df_dia, col_ts, por_defecto=10):
+    """Intervalo de muestreo estimado como la mediana de diferencias del día."""
+    if len(df_dia) < 2:
+        return por_defecto
+    diffs = df_dia[col_ts].diff().dt.total_seconds().dropna() / 60.0
+    return int(round(diffs.median())) if not diffs.empty else por_defecto
+
+
+def _sobre_umbral(df_dia, col_ts, col, umbral, paso):
+    """Tramos ≥ umbral, minutos que suman y % del día que representan."""
+    tramos = intervalos_sobre_umbral(df_dia, col_ts, col, umbral)
+    minutos = sum(int((fin - ini).total_seconds() / 60) for ini, fin in tramos)
+    minutos_totales = len(df_dia) * paso
+    porcentaje = round(100 * minutos / minutos_totales, 1) if minutos_totales else 0.0
+    return tramos, minutos, porcentaje
+
+
+def resultados_por_dia(df, col_ts, col_temp, col_hum, umbral, ventana_horas, intervalo_min=None,
+                       umbral_wbgt=None):
+    """
+    Métricas de cada día, comunes a todos los formatos de informe (PDF, HTML, JSON).
+    Devuelve una lista ordenada por fecha de dicts con:
+      fecha, df (filas del día), resumen, franja, tramos, minutos_sobre, porcentaje
+    y, si se indica umbral_wbgt y existe la columna wbgt_c (analyzer.thermal):
+      tramos_wbgt, minutos_wbgt, porcentaje_wbgt
+    Si intervalo_min es None se estima por día a partir de los timestamps.
+    """
+    resultados = []
+    fechas = df[col_ts].dt.date
+    for fecha, df_dia in df.groupby(fechas, sort=True):
+        df_dia = df_dia.sort_values(col_ts)
+        paso = intervalo_min if intervalo_min is not None else _paso_minutos(df_dia, col_ts)
+        tramos, minutos_sobre, porcentaje = _sobre_umbral(df_dia, col_ts, col_temp, umbral, paso)
+
+        dia = {
+            "fecha": fecha,
+            "df": df_dia,
+            "resumen": resumen_basico(df_dia, col_temp, col_hum),
+            "franja": franja_mas_caliente(df_dia, col_ts, col_temp, ventana_horas),
+            "tramos": tramos,
+            "minutos_sobre": minutos_sobre,
+            "porcentaje": porcentaje,
+        }
+        if umbral_wbgt is not None and "wbgt_c" in df_dia.columns and df_dia["wbgt_c"].notna().any():
+            dia["tramos_wbgt"], dia["minutos_wbgt"], dia["porcentaje_wbgt"] = _sobre_umbral(
+                df_dia, col_ts, "wbgt_c", umbral_wbgt, paso
+            )
+        resultados.append(dia)
+    return resultados
+
+
+def filas_derivadas(dia, umbral_wbgt=None):
+    """Filas (etiqueta, valor) de las métricas derivadas para las tablas de informe."""
+    r = dia["resumen"]
+    filas = []
+    if r.get("punto_rocio_media") is not None:
+        filas.append(("Punto de rocío medio (°C)", r["punto_rocio_media"]))
+    if r.get("indice_calor_max") is not None:
+        filas.append(("Índice de calor máx (°C)", r["indice_calor_max"]))
+    if r.get("wbgt_max") is not None:
+        filas.append(("WBGT aprox. máx (°C)", r["wbgt_max"]))
+    if "tramos_wbgt" in dia:
+        if dia["tramos_wbgt"]:
+            filas.append((
+                f"Tramos WBGT ≥ {umbral_wbgt} °C",
+                ", ".join(f"{ini.strftime('%H:%M')}–{fin.strftime('%H:%M')}" for ini, fin in dia["tramos_wbgt"]),
+            ))
+            filas.append(("% del día WBGT ≥ umbral", f"{dia['porcentaje_wbgt']}%"))
+        else:
+            filas.append((f"Tramos WBGT ≥ {umbral_wbgt} °C", "Ninguno"))
+    return filas
@@ -0,0 +1,222 @@
+# analyzer/ingest.py
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from analyzer.io_csv import cargar_csv
+from analyzer.merge import fusionar_lotes, fusionar_ordenado
+from analyzer.thermal import COLUMNAS_DERIVADAS, calcular_metricas_derivadas
+
+COLUMNAS = ["timestamp", "temp_c", "hum_pct", *COLUMNAS_DERIVADAS]
+MANIFIESTO = "ingesta_manifest.json"
+
+
+def firma_archivo(ruta, con_hash=False):
+    """Tamaño + mtime (y opcionalmente SHA-1) para saber si un archivo cambió."""
+    st = os.stat(ruta)
+    firma = {"size": st.st_size, "mtime": int(st.st_mtime_ns)}
+    if con_hash:
+        h = hashlib.sha1()
+        with open(ruta, "rb") as f:
+            for bloque in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloque)
+        firma["sha1"] = h.hexdigest()
+    return firma
+
+
+def estacion_de(ruta, raiz):
+    """La estación es la primera carpeta bajo la raíz (o el nombre del archivo)."""
+    rel = Path(ruta).relative_to(raiz)
+    return rel.parts[0] if len(rel.parts) > 1 else rel.stem
+
+
+def _leer_uno(args):
+    """
+    Se ejecuta en un proceso del pool: lee y valida un CSV y lo devuelve con
+    las columnas estándar (timestamp, temp_c, hum_pct) y las métricas derivadas.
+    """
+    ruta, estacion, col_ts, col_temp, col_hum = args
+    try:
+        df = cargar_csv(ruta, col_ts, col_temp, col_hum)
+        if isinstance(df[col_ts].dtype, pd.DatetimeTZDtype):
+            # Marcas con zona (…Z, +02:00): a UTC sin zona, como io_thingspeak,
+            # para poder fusionarlas con las de otros archivos
+            df[col_ts] = df[col_ts].dt.tz_convert(None)
+        if not pd.api.types.is_datetime64_any_dtype(df[col_ts]):
+            raise ValueError(f"La columna {col_ts} no contiene fechas válidas")
+        df = df.rename(columns={col_ts: "timestamp", col_temp: "temp_c", col_hum: "hum_pct"})
+        df["hum_pct"] = pd.to_numeric(df["hum_pct"], errors="coerce")
+        df = calcular_metricas_derivadas(df)
+        return ruta, estacion, df[COLUMNAS], None
+    except Exception as e:
+        return ruta, estacion, None, f"{type(e).__name__}: {e}"
+
+
+def resumen_diario(df):
+    """
+    Resumen por día: n, media/máx/mín de temperatura, humedad media y las
+    métricas derivadas (punto de rocío medio, índice de calor y WBGT máximos).
+    """
+    if df.empty:
+        return pd.DataFrame(columns=["fecha", "n", "temp_media", "temp_max", "temp_min", "hum_media",
+                                     "punto_rocio_media", "indice_calor_max", "wbgt_max"])
+    g = df.groupby(df["timestamp"].dt.date)
+    res = pd.DataFrame({
+        "n": g.size(),
+        "temp_media": g["temp_c"].mean().round(1),
+        "temp_max": g["temp_c"].max().round(1),
+        "temp_min": g["temp_c"].min().round(1),
+        "hum_media": g["hum_pct"].mean().round(1),
+        "punto_rocio_media": g["punto_rocio_c"].mean().round(1),
+        "indice_calor_max": g["indice_calor_c"].max().round(1),
+        "wbgt_max": g["wbgt_c"].max().round(1),
+    })
+    res.index.name = "fecha"
+    return res.reset_index()
+
+
+class AlmacenLocal:
+    """
+    Almacén en disco: un CSV ordenado por estación, su resumen diario y un
+    manifiesto con la firma de cada archivo ya ingerido.
+    """
+
+    def __init__(self, directorio):
+        self.dir = Path(directorio)
+        self.dir_series = self.dir / "estaciones"
+        self.dir_resumen = self.dir / "resumen_diario"
+        self.dir_series.mkdir(parents=True, exist_ok=True)
+        self.dir_resumen.mkdir(parents=True, exist_ok=True)
+        ruta = self.dir / MANIFIESTO
+        self.manifiesto = json.loads(ruta.read_text(encoding="utf-8")) if ruta.exists() else {}
+
+    def leer(self, estacion):
+        ruta = self.dir_series / f"{estacion}.csv"
+        if not ruta.exists():
+            return pd.DataFrame(columns=COLUMNAS)
+        df = pd.read_csv(ruta, parse_dates=["timestamp"])
+        if any(c not in df.columns for c in COLUMNAS_DERIVADAS):
+            # Almacén anterior a las métricas derivadas
+            df = calcular_metricas_derivadas(df)
+        return df
+
+    @staticmethod
+    def _escribir(df, ruta):
+        # Escritura atómica: un corte a mitad no deja el almacén corrupto
+        tmp = ruta.with_suffix(ruta.suffix + ".part")
+        df.to_csv(tmp, index=False)
+        tmp.replace(ruta)
+
+    def guardar(self, estacion, df):
+        self._escribir(df, self.dir_series / f"{estacion}.csv")
+        self._escribir(resumen_diario(df), self.dir_resumen / f"{estacion}.csv")
+
+    def guardar_manifiesto(self):
+        tmp = self.dir / (MANIFIESTO + ".part")
+        tmp.write_text(json.dumps(self.manifiesto, indent=1, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.dir / MANIFIESTO)
+
+    @staticmethod
+    def clave(ruta):
+        """Ruta absoluta resuelta: no depende del cwd ni de cómo se pasó la raíz."""
+        return str(Path(ruta).resolve())
+
+    def anotar(self, ruta, firma):
+        self.manifiesto[self.clave(ruta)] = firma
+
+    def pendiente(self, ruta, firma):
+        previa = self.manifiesto.get(self.clave(ruta))
+        if previa is None:
+            return True
+        if "sha1" in firma and "sha1" in previa:
+            return firma["sha1"] != previa["sha1"]
+        return firma["size"] != previa["size"] or firma["mtime"] != previa["mtime"]
+
+
+def ingerir_directorio(
+    raiz,
+    destino,
+    col_ts="timestamp",
+    col_temp="temp_c",
+    col_hum="hum_pct",
+    patron="*.csv",
+    con_hash=False,
+    procesos=None,
+    lote=500,
+    progreso=None,
+):
+    """
+    Ingiere todos los CSV bajo `raiz` en el almacén local `destino`.
+    - Los archivos se leen en un pool de procesos (por defecto, un proceso por núcleo).
+    - Cada estación se fusiona con su histórico sin duplicar lecturas.
+    - Se omiten archivos ya ingeridos con la misma firma (tamaño/mtime o hash);
+      los que fallan no se anotan y se reintentan (y notifican) en cada ejecución.
+    - El manifiesto se guarda tras cada lote de `lote` archivos: si el proceso
+      se interrumpe, al relanzarlo continúa donde se quedó.
+    Devuelve un dict con contadores y la lista de errores.
+    """
+    raiz = Path(raiz)
+    almacen = AlmacenLocal(destino)
+
+    archivos = sorted(p for p in raiz.rglob(patron) if p.is_file())
+
+    def chunksize(n):
+        return max(1, n // (4 * (procesos or os.cpu_count() or 1)))
+
+    # El pool arranca sus procesos al recibir la primera tarea
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        if con_hash:
+            # El SHA-1 lee cada archivo entero: se calcula en el pool
+            firmas = pool.map(partial(firma_archivo, con_hash=True), archivos, chunksize=chunksize(len(archivos)))
+        else:
+            firmas = (firma_archivo(r) for r in archivos)
+        pendientes = [(r, f) for r, f in zip(archivos, firmas) if almacen.pendiente(r, f)]
+
+        stats = {"encontrados": len(archivos), "omitidos": len(archivos) - len(pendientes),
+                 "ingeridos": 0, "filas": 0, "errores": []}
+
+        for i0 in range(0, len(pendientes), lote):
+            tanda = pendientes[i0: i0 + lote]
+            tareas = [(str(r), estacion_de(r, raiz), col_ts, col_temp, col_hum) for r, _ in tanda]
+
+            por_estacion = {}
+            fallidos = set()
+            for ruta, estacion, df, error in pool.map(_leer_uno, tareas, chunksize=chunksize(len(tareas))):
+                if error:
+                    stats["errores"].append((ruta, error))
+                    fallidos.add(ruta)
+                    continue
+                por_estacion.setdefault(estacion, []).append((ruta, df))
+
+            for estacion, leidos in por_estacion.items():
+                # Lotes ordenados por su primera lectura: casi todo son appends
+                leidos.sort(key=lambda x: x[1]["timestamp"].iloc[0] if len(x[1]) else pd.Timestamp.min)
+                try:
+                    nuevo = fusionar_lotes([df for _, df in leidos], clave="timestamp")
+                    almacen.guardar(estacion, fusionar_ordenado(almacen.leer(estacion), nuevo, clave="timestamp"))
+                except Exception as e:
+                    # Un fallo al fusionar una estación no detiene la ingesta: sus
+                    # archivos se notifican y quedan fuera del manifiesto
+                    for ruta, _ in leidos:
+                        stats["errores"].append((ruta, f"{estacion}: {type(e).__name__}: {e}"))
+                        fallidos.add(ruta)
+                    continue
+                stats["ingeridos"] += len(leidos)
+                stats["filas"] += sum(len(df) for _, df in leidos)
+
+            # Los archivos con error no se anotan: se vuelven a intentar y a
+            # notificar en la siguiente ejecución
+            for ruta, firma in tanda:
+                if str(ruta) not in fallidos:
+                    almacen.anotar(ruta, firma)
+            almacen.guardar_manifiesto()
+
+            if progreso is not None:
+                progreso(min(i0 + lote, len(pendientes)), len(pendientes))
+
+    return stats
@@ -2,6 +2,8 @@
 import requests
 import pandas as pd
 
+THINGSPEAK_URL = "https://api.thingspeak.com"
+
 
 def cargar_desde_thingspeak(
     channel_id: int,
@@ -9,26 +11,37 @@ def cargar_desde_thingspeak(
     field_temp: int = 1,
     field_hum: int = 2,
     results: int = 10000,
+    start=None,
+    end=None,
+    base_url: str = THINGSPEAK_URL,
 ) -> pd.DataFrame:
     """
     Descarga datos de ThingSpeak y devuelve un DataFrame con:
     - timestamp (datetime, sin zona horaria)
     - temp_c (float)
     - hum_pct (float o NaN)
+    - entry_id (int, identificador de lectura en ThingSpeak)
 
     Se asume:
       field_temp -> temperatura (°C)
       field_hum  -> humedad (%)
+
+    start / end (opcionales) acotan el rango en el servidor ("YYYY-MM-DD HH:MM:SS").
+    base_url permite apuntar a otro servidor (p.ej. tools/thingspeak_local.py).
     """
 
     # Endpoint correcto para varios campos:
     # https://api.thingspeak.com/channels/{id}/feeds.json
-    url = f"https://api.thingspeak.com/channels/{channel_id}/feeds.json"
+    url = f"{base_url.rstrip('/')}/channels/{channel_id}/feeds.json"
 
     params = {
         "api_key": read_api_key,
         "results": results,
     }
+    if start is not None:
+        params["start"] = str(start)
+    if end is not None:
+        params["end"] = str(end)
 
     resp = requests.get(url, params=params, timeout=10)
     resp.raise_for_status()  # si hay 4xx/5xx lanza excepción
@@ -38,7 +51,7 @@ def cargar_desde_thingspeak(
 
     if not feeds:
         # DataFrame vacío con las columnas esperadas
-        return pd.DataFrame(columns=["timestamp", "temp_c", "hum_pct"])
+        return pd.DataFrame(columns=["timestamp", "temp_c", "hum_pct", "entry_id"])
 
     df = pd.DataFrame(feeds)
 
@@ -56,8 +69,10 @@ def cargar_desde_thingspeak(
     else:
         df["hum_pct"] = pd.NA
 
+    df["entry_id"] = pd.to_numeric(df.get("entry_id"), errors="coerce").astype("Int64")
+
     df = (
-        df[["timestamp", "temp_c", "hum_pct"]]
+        df[["timestamp", "temp_c", "hum_pct", "entry_id"]]
         .dropna(subset=["timestamp", "temp_c"])
         .sort_values("timestamp")
         .reset_index(drop=True)
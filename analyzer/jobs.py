@@ -0,0 +1,181 @@
+# analyzer/jobs.py
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class InformeCancelado(Exception):
+    """Se lanza dentro de un trabajo cuando el usuario lo ha cancelado."""
+
+
+class Trabajo:
+    """
+    Estado de un trabajo en segundo plano.
+    - estado: "pendiente", "en_curso", "terminado", "cancelado" o "error".
+    - hecho / total: progreso (p.ej. días procesados del informe).
+    - resultado: lo que devuelva la función (p.ej. ruta del PDF).
+    - sesiones: sesiones de la UI que esperan el resultado (deduplicadas).
+    """
+
+    def __init__(self, clave):
+        self.clave = clave
+        self.estado = "pendiente"
+        self.hecho = 0
+        self.total = 0
+        self.detalle = ""
+        self.resultado = None
+        self.error = None
+        self.sesiones = set()
+        self.fin = None  # time.monotonic() al terminar (para la caducidad)
+        self._cancelar = threading.Event()
+        self._future = None
+
+    # --- Llamadas desde la función del trabajo ---
+    def progreso(self, hecho, total, detalle=""):
+        self.hecho = int(hecho)
+        self.total = int(total)
+        self.detalle = detalle
+        if self._cancelar.is_set():
+            raise InformeCancelado(self.clave)
+
+    def cancelado(self):
+        return self._cancelar.is_set()
+
+    # --- Llamadas desde la UI ---
+    def cancelar(self):
+        self._cancelar.set()
+        if self._future is not None and self._future.cancel():
+            self.fin = time.monotonic()
+            self.estado = "cancelado"
+
+    @property
+    def activo(self):
+        return self.estado in ("pendiente", "en_curso")
+
+    @property
+    def fraccion(self):
+        return self.hecho / self.total if self.total else 0.0
+
+
+class ColaTrabajos:
+    """
+    Cola de trabajos con un pool de hilos compartido entre sesiones.
+    - Los trabajos se deduplican por clave: si ya hay uno activo o terminado
+      con la misma clave, se devuelve ese en lugar de lanzar otro.
+    - Los trabajos terminados se guardan como caché; `valido` permite
+      descartar un resultado que ya no sirve (p.ej. el PDF se ha borrado).
+    - La caché está acotada: se conservan como mucho `max_trabajos` trabajos
+      terminados (los usados hace más tiempo salen primero) y ninguno más de
+      `caducidad_s` segundos. Al descartar uno se llama a `al_descartar(trabajo)`
+      (p.ej. para borrar su PDF y sus gráficos).
+    """
+
+    def __init__(self, max_workers=2, max_trabajos=32, caducidad_s=None, al_descartar=None):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="informe")
+        self._trabajos = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_trabajos = int(max_trabajos)
+        self.caducidad_s = caducidad_s
+        self.al_descartar = al_descartar
+
+    def enviar(self, clave, fn, *args, valido=None, sesion=None, **kwargs):
+        """
+        Encola `fn(trabajo, *args, **kwargs)` salvo que ya exista un trabajo
+        reutilizable con la misma clave. Devuelve el Trabajo.
+        `sesion` identifica a quien lo pide, para `cancelar`.
+        """
+        with self._lock:
+            previo = self._trabajos.get(clave)
+            if previo is not None:
+                self._trabajos.move_to_end(clave)
+                if previo.activo:
+                    if sesion is not None:
+                        previo.sesiones.add(sesion)
+                    return previo
+                if previo.estado == "terminado" and (valido is None or valido(previo.resultado)):
+                    return previo
+
+            trabajo = Trabajo(clave)
+            if sesion is not None:
+                trabajo.sesiones.add(sesion)
+            self._trabajos[clave] = trabajo
+            self._trabajos.move_to_end(clave)
+            descartados = self._purgar()
+            trabajo._future = self._pool.submit(self._ejecutar, trabajo, fn, args, kwargs)
+
+        # Borrar archivos fuera del lock: puede ser lento
+        self._descartar(descartados)
+        return trabajo
+
+    def cancelar(self, clave, sesion=None):
+        """
+        Retira a `sesion` del trabajo y solo lo cancela de verdad cuando no
+        queda ninguna otra sesión esperándolo. Devuelve True si se canceló.
+        """
+        with self._lock:
+            trabajo = self._trabajos.get(clave)
+            if trabajo is None or not trabajo.activo:
+                return False
+            trabajo.sesiones.discard(sesion)
+            if trabajo.sesiones:
+                return False
+            trabajo.cancelar()
+            return True
+
+    def obtener(self, clave):
+        with self._lock:
+            trabajo = self._trabajos.get(clave)
+            if trabajo is not None:
+                self._trabajos.move_to_end(clave)
+            descartados = self._purgar()
+        self._descartar(descartados)
+        return trabajo if trabajo not in descartados else None
+
+    def _purgar(self):
+        """Saca de la caché los trabajos caducados y los que sobran (LRU). Con el lock."""
+        ahora = time.monotonic()
+        inactivos = [t for t in self._trabajos.values() if not t.activo]  # del más antiguo al más reciente
+        sobran = max(0, len(inactivos) - self.max_trabajos)
+        descartados = inactivos[:sobran]
+        if self.caducidad_s is not None:
+            descartados += [
+                t for t in inactivos[sobran:]
+                if t.fin is not None and ahora - t.fin > self.caducidad_s
+            ]
+        for t in descartados:
+            del self._trabajos[t.clave]
+        return descartados
+
+    def _descartar(self, trabajos):
+        if self.al_descartar is None:
+            return
+        for t in trabajos:
+            try:
+                self.al_descartar(t)
+            except Exception:
+                pass
+
+    def activos(self):
+        with self._lock:
+            return [t for t in self._trabajos.values() if t.activo]
+
+    @staticmethod
+    def _ejecutar(trabajo, fn, args, kwargs):
+        if trabajo.cancelado():
+            trabajo.fin = time.monotonic()
+            trabajo.estado = "cancelado"
+            return None
+        trabajo.estado = "en_curso"
+        try:
+            trabajo.resultado = fn(trabajo, *args, **kwargs)
+        except InformeCancelado:
+            estado = "cancelado"
+        except Exception as e:
+            trabajo.error = e
+            estado = "error"
+        else:
+            estado = "terminado"
+        trabajo.fin = time.monotonic()
+        trabajo.estado = estado
+        return trabajo.resultado
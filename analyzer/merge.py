@@ -0,0 +1,97 @@
+# analyzer/merge.py
+import numpy as np
+import pandas as pd
+
+CONFLICTOS = ("nuevo", "base")
+
+
+def _orden_fusion(a, b):
+    """
+    Permutación que intercala dos arrays ya ordenados (a y luego b concatenados)
+    sin reordenar. Ante empates, las filas de `a` quedan antes que las de `b`.
+    """
+    pos_a = np.arange(len(a)) + np.searchsorted(b, a, side="left")
+    pos_b = np.arange(len(b)) + np.searchsorted(a, b, side="right")
+    orden = np.empty(len(a) + len(b), dtype=np.intp)
+    orden[pos_a] = np.arange(len(a))
+    orden[pos_b] = len(a) + np.arange(len(b))
+    return orden
+
+
+def _clave_dedup(col_ts, clave, *dfs):
+    """entry_id solo sirve de clave si todos los lotes lo traen completo (los CSV no)."""
+    dfs = [d for d in dfs if d is not None]
+    if clave is None:
+        con_id = all("entry_id" in d.columns and d["entry_id"].notna().all() for d in dfs)
+        return "entry_id" if con_id else col_ts
+    if any(clave not in d.columns for d in dfs):
+        raise ValueError(f"Columna de deduplicación inexistente: {clave}")
+    return clave
+
+
+def fusionar_ordenado(base, nuevo, col_ts="timestamp", clave=None, conflicto="nuevo"):
+    """
+    Fusiona dos DataFrames ya ordenados por `col_ts` y elimina duplicados.
+    - clave: columna que identifica una lectura ("entry_id" o el timestamp).
+      Por defecto usa entry_id si existe y, si no, el timestamp.
+    - conflicto: qué fila se conserva ante duplicados ("nuevo" o "base").
+
+    Solo se toca la cola de `base` que solapa con `nuevo`: si los datos nuevos
+    van detrás del histórico es un simple append, sin reordenar nada.
+    Devuelve un DataFrame nuevo con índice 0..n-1.
+    """
+    if conflicto not in CONFLICTOS:
+        raise ValueError(f"conflicto debe ser uno de {CONFLICTOS}")
+    if base is None or base.empty:
+        return fusionar_lotes([nuevo], col_ts, clave, conflicto)
+    if nuevo is None or nuevo.empty:
+        return base.reset_index(drop=True)
+
+    clave = _clave_dedup(col_ts, clave, base, nuevo)
+    ts_base = base[col_ts].to_numpy()
+    ts_nuevo = nuevo[col_ts].to_numpy()
+
+    # Solape: desde la primera lectura de `base` que puede coincidir con `nuevo`
+    corte = int(np.searchsorted(ts_base, ts_nuevo[0], side="left"))
+    if clave != col_ts:
+        # Un entry_id repetido puede venir con otro timestamp: basta con
+        # retroceder hasta el primer entry_id >= el menor de los nuevos
+        ids_base = base[clave].to_numpy()
+        min_id = nuevo[clave].min()
+        if len(ids_base) and ids_base[-1] >= min_id:
+            corte = min(corte, int(np.searchsorted(ids_base, min_id, side="left")))
+
+    cabeza = base.iloc[:corte]
+    cola = base.iloc[corte:]
+    if cola.empty and not nuevo[clave].duplicated().any():
+        return pd.concat([cabeza, nuevo], ignore_index=True)
+
+    # Duplicados según el origen de cada fila (cola de `base` y luego `nuevo`),
+    # no según su posición por timestamp: un entry_id repetido puede llegar
+    # con un timestamp anterior al de la fila de `base`
+    todo = pd.concat([cola, nuevo], ignore_index=True)
+    keep = "last" if conflicto == "nuevo" else "first"
+    duplicada = todo[clave].duplicated(keep=keep).to_numpy()
+    orden = _orden_fusion(cola[col_ts].to_numpy(), ts_nuevo)
+    tramo = todo.take(orden[~duplicada[orden]])
+    return pd.concat([cabeza, tramo], ignore_index=True)
+
+
+def fusionar_lotes(lotes, col_ts="timestamp", clave=None, conflicto="nuevo"):
+    """
+    Fusiona una lista de lotes ordenados (en orden de llegada: los posteriores
+    son los "nuevos" para la regla de conflicto) y elimina duplicados.
+    """
+    lotes = [l for l in lotes if l is not None and not l.empty]
+    if not lotes:
+        return pd.DataFrame(columns=["timestamp", "temp_c", "hum_pct"])
+
+    res = lotes[0].reset_index(drop=True)
+    clave_res = _clave_dedup(col_ts, clave, res)
+    keep = "last" if conflicto == "nuevo" else "first"
+    if res[clave_res].duplicated().any():
+        res = res[~res[clave_res].duplicated(keep=keep)].reset_index(drop=True)
+    for lote in lotes[1:]:
+        res = fusionar_ordenado(res, lote, col_ts, clave, conflicto)
+    return res
+
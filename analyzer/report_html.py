@@ -0,0 +1,210 @@
+# analyzer/report_html.py
+"""
+Informe ligero en HTML autocontenido (gráficos SVG en línea) y resumen JSON,
+a partir de los mismos resultados por día que el PDF (analyzer.daily).
+No usa matplotlib ni ReportLab: sirve como vista previa rápida.
+"""
+import html
+import json
+
+import numpy as np
+import pandas as pd
+
+from analyzer.daily import filas_derivadas
+
+MAX_PUNTOS_SVG = 400
+
+
+def _reducir(x, y, max_puntos=MAX_PUNTOS_SVG):
+    """
+    Reduce la serie a ~max_puntos conservando picos: en cada cubo se
+    quedan el mínimo y el máximo (en su orden temporal).
+    """
+    n = len(y)
+    if n <= max_puntos:
+        return x, y
+    k = -(-n // (max_puntos // 2))  # filas por cubo (redondeo hacia arriba)
+    relleno = np.full(-n % k, np.nan)
+    cubos = np.r_[y, relleno].reshape(-1, k)
+    base = np.arange(len(cubos)) * k
+    i_max = base + np.argmax(np.where(np.isnan(cubos), -np.inf, cubos), axis=1)
+    i_min = base + np.argmin(np.where(np.isnan(cubos), np.inf, cubos), axis=1)
+    sel = np.unique(np.r_[i_min, i_max])
+    sel = sel[sel < n]
+    return x[sel], y[sel]
+
+
+def svg_serie(ts, valores, color="red", umbral=None, unidad="°C", ancho=640, alto=220,
+              extra=None, color_extra="purple"):
+    """
+    Gráfico de línea como SVG en línea (eje X: horas del día).
+    `extra` es una segunda serie opcional sobre el mismo eje (p.ej. WBGT).
+    """
+    x_todo = pd.to_datetime(pd.Series(ts)).to_numpy("datetime64[s]").astype("int64").astype(float)
+    y = pd.to_numeric(pd.Series(valores), errors="coerce").to_numpy(dtype=float)
+    ok = ~np.isnan(y)
+    if not ok.any():
+        return ""
+    x, y = _reducir(x_todo[ok], y[ok])
+
+    x2 = y2 = None
+    if extra is not None:
+        y2 = pd.to_numeric(pd.Series(extra), errors="coerce").to_numpy(dtype=float)
+        ok2 = ~np.isnan(y2)
+        x2, y2 = _reducir(x_todo[ok2], y2[ok2]) if ok2.any() else (None, None)
+
+    margen_i, margen_d, margen_s, margen_b = 42, 10, 10, 24
+    ymin, ymax = float(y.min()), float(y.max())
+    if y2 is not None:
+        ymin, ymax = min(ymin, float(y2.min())), max(ymax, float(y2.max()))
+    if umbral is not None:
+        ymin, ymax = min(ymin, umbral), max(ymax, umbral)
+    if ymax - ymin < 1e-9:
+        ymin, ymax = ymin - 1, ymax + 1
+    x0, x1 = float(x.min()), float(x.max()) if x.max() > x.min() else float(x.min()) + 1
+
+    def px(v):
+        return margen_i + (v - x0) / (x1 - x0) * (ancho - margen_i - margen_d)
+
+    def py(v):
+        return alto - margen_b - (v - ymin) / (ymax - ymin) * (alto - margen_s - margen_b)
+
+    puntos = " ".join(f"{a:.1f},{b:.1f}" for a, b in zip(px(x), py(y)))
+    partes = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {ancho} {alto}" width="100%" '
+        f'style="max-width:{ancho}px">',
+        f'<rect x="{margen_i}" y="{margen_s}" width="{ancho - margen_i - margen_d}" '
+        f'height="{alto - margen_s - margen_b}" fill="none" stroke="#ccc"/>',
+    ]
+    for v in np.linspace(ymin, ymax, 5):
+        partes.append(f'<text x="{margen_i - 4}" y="{py(v) + 4:.1f}" font-size="10" text-anchor="end">{v:.1f}</text>')
+    for t in np.linspace(x0, x1, 7):
+        etiqueta = pd.Timestamp(int(t), unit="s").strftime("%H:%M")
+        partes.append(f'<text x="{px(t):.1f}" y="{alto - 6}" font-size="10" text-anchor="middle">{etiqueta}</text>')
+    if umbral is not None:
+        partes.append(
+            f'<line x1="{margen_i}" x2="{ancho - margen_d}" y1="{py(umbral):.1f}" y2="{py(umbral):.1f}" '
+            f'stroke="orange" stroke-dasharray="5,4"><title>Umbral {umbral} {unidad}</title></line>'
+        )
+    if y2 is not None:
+        puntos2 = " ".join(f"{a:.1f},{b:.1f}" for a, b in zip(px(x2), py(y2)))
+        partes.append(f'<polyline points="{puntos2}" fill="none" stroke="{color_extra}" stroke-width="1"/>')
+    partes.append(f'<polyline points="{puntos}" fill="none" stroke="{color}" stroke-width="1.5"/>')
+    partes.append("</svg>")
+    return "".join(partes)
+
+
+def _hora(t):
+    return t.strftime("%H:%M")
+
+
+def resumen_json(dias, umbral, ventana_horas, titulo="", cliente="", umbral_wbgt=None):
+    """Resumen serializable (dict) de los resultados por día."""
+    return {
+        "titulo": titulo,
+        "cliente": cliente,
+        "umbral": umbral,
+        "umbral_wbgt": umbral_wbgt,
+        "ventana_horas": ventana_horas,
+        "dias": [
+            {
+                "fecha": str(d["fecha"]),
+                **d["resumen"],
+                "franja": None if not d["franja"] else {
+                    "inicio": d["franja"]["inicio"].isoformat(),
+                    "fin": d["franja"]["fin"].isoformat(),
+                    "temp_media": d["franja"]["temp_media_franja"],
+                },
+                "tramos": [[ini.isoformat(), fin.isoformat()] for ini, fin in d["tramos"]],
+                "minutos_sobre_umbral": d["minutos_sobre"],
+                "porcentaje_sobre_umbral": d["porcentaje"],
+                **({
+                    "tramos_wbgt": [[ini.isoformat(), fin.isoformat()] for ini, fin in d["tramos_wbgt"]],
+                    "minutos_wbgt": d["minutos_wbgt"],
+                    "porcentaje_wbgt": d["porcentaje_wbgt"],
+                } if "tramos_wbgt" in d else {}),
+            }
+            for d in dias
+        ],
+    }
+
+
+def generar_json(dias, out_path, umbral, ventana_horas, titulo="", cliente="", umbral_wbgt=None):
+    data = resumen_json(dias, umbral, ventana_horas, titulo, cliente, umbral_wbgt)
+    out_path.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+    return out_path
+
+
+def html_informe(dias, col_ts, col_temp, col_hum, umbral, ventana_horas,
+                 titulo="Informe PRL-Tech", cliente="", nota_legal="", umbral_wbgt=None):
+    """Devuelve el informe como cadena HTML autocontenida."""
+    e = html.escape
+    cuerpo = [f"<h1>{e(titulo)}</h1>"]
+    if cliente:
+        cuerpo.append(f"<h2>{e(cliente)}</h2>")
+    cuerpo.append(f"<p>Umbral temperatura: {umbral} °C – Ventana franja: {ventana_horas} h</p>")
+
+    for d in dias:
+        r, franja, tramos = d["resumen"], d["franja"], d["tramos"]
+        filas = [
+            ("Registros", r["n"]),
+            ("Temp. media (°C)", r["temp_media"]),
+            ("Temp. máx (°C)", r["temp_max"]),
+            ("Temp. mín (°C)", r["temp_min"]),
+        ]
+        if r["hum_media"] is not None:
+            filas.append(("Humedad media (%)", r["hum_media"]))
+        filas.append((
+            f"Franja más calurosa ({ventana_horas} h)",
+            f"{_hora(franja['inicio'])} → {_hora(franja['fin'])} ({franja['temp_media_franja']} °C)"
+            if franja else "No disponible",
+        ))
+        if tramos:
+            filas.append((f"Tramos ≥ {umbral} °C", ", ".join(f"{_hora(a)}–{_hora(b)}" for a, b in tramos)))
+            filas.append(("% del día ≥ umbral", f"{d['porcentaje']}%"))
+        else:
+            filas.append((f"Tramos ≥ {umbral} °C", "Ninguno"))
+        filas.extend(filas_derivadas(d, umbral_wbgt))
+
+        cuerpo.append(f"<section><h2>Día {d['fecha']}</h2><table>")
+        cuerpo.extend(f"<tr><th>{e(str(k))}</th><td>{e(str(v))}</td></tr>" for k, v in filas)
+        cuerpo.append("</table>")
+
+        df_dia = d["df"]
+        cuerpo.append("<h3>Temperatura</h3>")
+        wbgt = df_dia["wbgt_c"] if "wbgt_c" in df_dia.columns else None
+        cuerpo.append(svg_serie(df_dia[col_ts], df_dia[col_temp], "red", umbral, extra=wbgt))
+        if col_hum in df_dia.columns and df_dia[col_hum].notna().any():
+            cuerpo.append("<h3>Humedad</h3>")
+            cuerpo.append(svg_serie(df_dia[col_ts], df_dia[col_hum], "blue", unidad="%"))
+        cuerpo.append("</section>")
+
+    if nota_legal.strip():
+        cuerpo.append("<footer><h3>Nota:</h3>")
+        cuerpo.extend(f"<p>{e(linea)}</p>" for linea in nota_legal.splitlines() if linea.strip())
+        cuerpo.append("</footer>")
+
+    estilo = (
+        "body{font-family:Helvetica,Arial,sans-serif;max-width:760px;margin:2em auto;color:#222}"
+        "table{border-collapse:collapse;margin:.5em 0}"
+        "th,td{border:1px solid #999;padding:3px 8px;text-align:left;font-size:14px}"
+        "th{background:#eee;font-weight:normal}"
+        "section{border-top:1px solid #ccc;margin-top:1.5em}"
+        "footer{font-size:12px;color:#555;margin-top:2em}"
+    )
+    return (
+        '<!DOCTYPE html><html lang="es"><head><meta charset="utf-8">'
+        f"<title>{e(titulo)}</title><style>{estilo}</style></head><body>"
+        + "\n".join(cuerpo)
+        + "</body></html>"
+    )
+
+
+def generar_html(dias, out_path, col_ts, col_temp, col_hum, umbral, ventana_horas,
+                 titulo="Informe PRL-Tech", cliente="", nota_legal="", umbral_wbgt=None):
+    out_path.write_text(
+        html_informe(dias, col_ts, col_temp, col_hum, umbral, ventana_horas, titulo, cliente, nota_legal,
+                     umbral_wbgt),
+        encoding="utf-8",
+    )
+    return out_path
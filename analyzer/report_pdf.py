@@ -0,0 +1,457 @@
+# analyzer/report_pdf.py
+"""
+Informes PDF (ReportLab + gráficos matplotlib).
+
+Junto con analyzer.charts (que solo se importa desde aquí), es la única parte
+del paquete que importa ReportLab y matplotlib: main.py y la UI lo importan
+solo al generar un PDF, para que el arranque en frío, las recargas de
+Streamlit y los procesos hijos no paguen ese coste. Todos los gráficos usan
+la API de Figure, sin pyplot, porque la UI genera los PDF en hilos.
+"""
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+
+# Estático para PDF (API orientada a objetos: se usa desde hilos de trabajo)
+from matplotlib.figure import Figure
+import matplotlib.dates as mdates
+
+# ReportLab (PDF)
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import (
+    SimpleDocTemplate,
+    Paragraph,
+    Spacer,
+    Image,
+    Table,
+    TableStyle,
+    PageBreak,
+)
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib import colors
+from reportlab.lib.units import mm
+
+from analyzer.charts import grafica_temp, grafica_hum
+from analyzer.compare import estadisticas_por_estacion, comparativa_temporal, resumen_comparativa
+from analyzer.daily import resultados_por_dia, filas_derivadas
+
+OUT_PDF = Path("outputs/informes")
+OUT_PNG = Path("outputs/graficos")
+
+
+# --------------------------
+# Informe semanal (main.py)
+# --------------------------
+def generar_pdf_semana(cfg, df, dias=None):
+    salida_pdf_dir = Path(cfg["salida_informes"])
+    salida_png_dir = Path(cfg["salida_graficos"])
+    salida_pdf_dir.mkdir(parents=True, exist_ok=True)
+    salida_png_dir.mkdir(parents=True, exist_ok=True)
+
+    nota_legal = Path(cfg["nota_legal_path"]).read_text(encoding="utf-8")
+
+    pdf_path = salida_pdf_dir / "informe_semana.pdf"
+    doc = SimpleDocTemplate(
+        str(pdf_path),
+        pagesize=A4,
+        leftMargin=18 * mm,
+        rightMargin=18 * mm,
+        topMargin=18 * mm,
+        bottomMargin=18 * mm,
+    )
+    styles = getSampleStyleSheet()
+    story = []
+
+    # Portada
+    story.append(Paragraph(cfg.get("titulo_informe", "Informe PRL-Tech"), styles["Title"]))
+    story.append(Spacer(1, 6 * mm))
+    story.append(Paragraph(cfg.get("nombre_cliente", ""), styles["Heading2"]))
+    story.append(Spacer(1, 10 * mm))
+
+    col_ts, col_temp, col_hum = cfg["col_timestamp"], cfg["col_temp"], cfg["col_hum"]
+    umbral = float(cfg["umbral_alerta_temp"])
+    umbral_wbgt = float(cfg["umbral_wbgt"]) if cfg.get("umbral_wbgt") is not None else None
+    ventana_horas = int(cfg["franja_resumen_horas"])
+
+    if dias is None:
+        dias = resultados_por_dia(
+            df, col_ts, col_temp, col_hum, umbral, ventana_horas, float(cfg["intervalo_min"]), umbral_wbgt
+        )
+    for idx, dia in enumerate(dias):
+        fecha, df_dia = dia["fecha"], dia["df"]
+        resumen, franja, tramos = dia["resumen"], dia["franja"], dia["tramos"]
+
+        # Tabla resumen
+        tabla_data = [
+            ["Día", str(fecha)],
+            ["Registros", resumen["n"]],
+            ["Temp. media (°C)", resumen["temp_media"]],
+            ["Temp. máx (°C)", resumen["temp_max"]],
+            ["Temp. mín (°C)", resumen["temp_min"]],
+        ]
+        if resumen["hum_media"] is not None:
+            tabla_data.append(["Humedad media (%)", resumen["hum_media"]])
+
+        if franja:
+            tabla_data.append([
+                f"Franja más calurosa ({ventana_horas} h)",
+                f"{franja['inicio'].strftime('%H:%M')} → {franja['fin'].strftime('%H:%M')} "
+                f"({franja['temp_media_franja']} °C)",
+            ])
+        else:
+            tabla_data.append([f"Franja más calurosa ({ventana_horas} h)", "No disponible"])
+
+        # Tramos ≥ umbral
+        if tramos:
+            porcentaje = dia["porcentaje"]
+            tramos_texto = ", ".join(f"{ini.strftime('%H:%M')}–{fin.strftime('%H:%M')}" for ini, fin in tramos)
+            tabla_data.append([f"Tramos ≥ {umbral} °C", tramos_texto])
+            tabla_data.append(["% del día ≥ umbral", f"{porcentaje}%"])
+        else:
+            tabla_data.append([f"Tramos ≥ {umbral} °C", "Ninguno"])
+
+        for etiqueta, valor in filas_derivadas(dia, umbral_wbgt):
+            tabla_data.append([etiqueta, valor])
+
+        tabla = Table(tabla_data, hAlign="LEFT", colWidths=[60 * mm, 105 * mm])
+        tabla.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("BOX", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ]))
+
+        # Gráficos
+        png_temp = Path(cfg["salida_graficos"]) / f"dia_{fecha}_temp.png"
+        grafica_temp(df_dia, col_ts, col_temp, png_temp, f"{fecha} – Temperatura", umbral=umbral)
+        img_temp = Image(str(png_temp)); img_temp._restrictSize(170 * mm, 120 * mm)
+
+        img_hum = None
+        png_hum = Path(cfg["salida_graficos"]) / f"dia_{fecha}_hum.png"
+        result = grafica_hum(df_dia, col_ts, col_hum, png_hum, f"{fecha} – Humedad")
+        if result:
+            img_hum = Image(str(png_hum)); img_hum._restrictSize(170 * mm, 120 * mm)
+
+        story.append(Paragraph(f"Día {fecha}", styles["Heading2"]))
+        story.append(Spacer(1, 4 * mm))
+        story.append(tabla)
+        story.append(Spacer(1, 6 * mm))
+        story.append(Paragraph("Gráfico de temperatura", styles["Heading3"]))
+        story.append(img_temp)
+
+        if img_hum is not None:
+            story.append(Spacer(1, 4 * mm))
+            story.append(Paragraph("Gráfico de humedad", styles["Heading3"]))
+            story.append(img_hum)
+
+        if idx < len(dias) - 1:
+            story.append(PageBreak())
+
+    # Nota legal
+    story.append(Spacer(1, 8 * mm))
+    story.append(Paragraph("<b>Nota:</b>", styles["Heading3"]))
+    for linea in nota_legal.splitlines():
+        story.append(Paragraph(linea, styles["Normal"]))
+
+    doc.build(story)
+    return pdf_path
+
+
+# --------------------------
+# Informes de la UI (cola de trabajos)
+# --------------------------
+def grafica_temp_png(df: pd.DataFrame, titulo: str, umbral: float, out_path: Path):
+    fig = Figure()
+    ax = fig.subplots()
+    ax.plot(df["timestamp"], df["temp_c"], label="Temperatura (°C)")
+    if "wbgt_c" in df.columns and df["wbgt_c"].notna().any():
+        ax.plot(df["timestamp"], df["wbgt_c"], linewidth=0.9, label="WBGT aprox. (°C)")
+    if umbral is not None:
+        ax.axhline(umbral, linestyle="--", linewidth=1.2, label=f"Umbral {umbral} °C")
+        y2 = df["temp_c"].to_numpy(dtype=float)
+        ax.fill_between(df["timestamp"], y2, umbral, where=y2 >= umbral, alpha=0.25)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.set_title(titulo)
+    ax.set_xlabel("Hora del día")
+    ax.set_ylabel("Temperatura (°C)")
+    fig.tight_layout()
+    ax.legend()
+    fig.savefig(out_path)
+
+
+def grafica_hum_png(df: pd.DataFrame, titulo: str, out_path: Path):
+    if not df["hum_pct"].notna().any():
+        return None
+    fig = Figure()
+    ax = fig.subplots()
+    ax.plot(df["timestamp"], df["hum_pct"], label="Humedad (%)")
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.set_title(titulo)
+    ax.set_xlabel("Hora del día")
+    ax.set_ylabel("Humedad (%)")
+    fig.tight_layout()
+    ax.legend()
+    fig.savefig(out_path)
+    return out_path
+
+
+def _huella(clave):
+    """Hash corto de la clave del trabajo, para nombres de archivo únicos."""
+    return hashlib.sha1(repr(clave).encode("utf-8")).hexdigest()[:10]
+
+
+def generar_pdf(
+    trabajo,
+    df: pd.DataFrame,
+    fecha_ini,
+    fecha_fin,
+    umbral: float,
+    ventana_horas: int,
+    nombre_cliente: str = "",
+    out_pdf: Path = OUT_PDF,
+    out_png: Path = OUT_PNG,
+    nota_legal: str = "",
+    umbral_wbgt: float = None,
+):
+    """
+    Construye el PDF del rango indicado. Se ejecuta en un hilo de la cola de
+    informes: `trabajo` recibe el progreso por día y permite cancelar.
+    Devuelve la ruta del PDF o None si no hay datos en el rango.
+    """
+    d0 = pd.to_datetime(fecha_ini)
+    d1 = pd.to_datetime(fecha_fin)
+    fechas_df = df["timestamp"].dt.date
+    mask = (fechas_df >= d0.date()) & (fechas_df <= d1.date())
+    dsub = df.loc[mask].copy()
+    if dsub.empty:
+        return None
+
+    # Nombre único por trabajo: la clave incluye canal, parámetros y versión
+    # de los datos, así que varios trabajos pueden convivir en disco
+    pdf_name = f"informe_{d0.date()}_a_{d1.date()}_{_huella(trabajo.clave)}.pdf"
+    pdf_path = out_pdf / pdf_name
+    tmp_path = pdf_path.with_suffix(".pdf.part")
+
+    doc = SimpleDocTemplate(
+        str(tmp_path),
+        pagesize=A4,
+        leftMargin=18 * mm,
+        rightMargin=18 * mm,
+        topMargin=18 * mm,
+        bottomMargin=18 * mm,
+    )
+    styles = getSampleStyleSheet()
+    story = []
+
+    story.append(Paragraph("Informe térmico orientativo – PRL-Tech", styles["Title"]))
+    if nombre_cliente:
+        story.append(Paragraph(nombre_cliente, styles["Heading2"]))
+    story.append(Paragraph(f"Rango: {d0.date()} → {d1.date()}", styles["Normal"]))
+    story.append(Paragraph(f"Umbral temperatura: {umbral} °C – Ventana franja: {ventana_horas} h", styles["Normal"]))
+    story.append(Spacer(1, 10 * mm))
+
+    dias = resultados_por_dia(dsub, "timestamp", "temp_c", "hum_pct", umbral, ventana_horas, umbral_wbgt=umbral_wbgt)
+    prefijo = pdf_path.stem
+    for i, dia in enumerate(dias):
+        f, dd = dia["fecha"], dia["df"]
+        trabajo.progreso(i, len(dias), f"Día {f}")
+        res, franja, tramos = dia["resumen"], dia["franja"], dia["tramos"]
+
+        tabla_data = [
+            ["Día", str(f)],
+            ["Registros", res["n"]],
+            ["Temp. media (°C)", res["temp_media"]],
+            ["Temp. máx (°C)", res["temp_max"]],
+            ["Temp. mín (°C)", res["temp_min"]],
+        ]
+        if res["hum_media"] is not None:
+            tabla_data.append(["Humedad media (%)", res["hum_media"]])
+
+        if franja:
+            tabla_data.append(
+                [
+                    "Franja más calurosa",
+                    f"{franja['inicio'].strftime('%H:%M')} → {franja['fin'].strftime('%H:%M')} "
+                    f"({franja['temp_media_franja']} °C)",
+                ]
+            )
+        else:
+            tabla_data.append(["Franja más calurosa", "No disponible"])
+
+        if tramos:
+            tabla_data.append(
+                [
+                    f"Tramos ≥ {umbral} °C",
+                    ", ".join(f"{ini.strftime('%H:%M')}–{fin.strftime('%H:%M')}" for ini, fin in tramos),
+                ]
+            )
+            tabla_data.append(["% del día ≥ umbral", f"{dia['porcentaje']}%"])
+        else:
+            tabla_data.append([f"Tramos ≥ {umbral} °C", "Ninguno"])
+
+        for etiqueta, valor in filas_derivadas(dia, umbral_wbgt):
+            tabla_data.append([etiqueta, valor])
+
+        tabla = Table(tabla_data, hAlign="LEFT", colWidths=[60 * mm, 105 * mm])
+        tabla.setStyle(
+            TableStyle(
+                [
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+                    ("BOX", (0, 0), (-1, -1), 0.5, colors.grey),
+                    ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
+                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ]
+            )
+        )
+
+        png_temp = out_png / f"{prefijo}_{f}_temp.png"
+        grafica_temp_png(dd, f"{f} – Temperatura", umbral, png_temp)
+        img_temp = Image(str(png_temp))
+        img_temp._restrictSize(170 * mm, 120 * mm)
+
+        story.append(Paragraph(f"Día {f}", styles["Heading2"]))
+        story.append(Spacer(1, 4 * mm))
+        story.append(tabla)
+        story.append(Spacer(1, 6 * mm))
+        story.append(Paragraph("Gráfico de temperatura", styles["Heading3"]))
+        story.append(img_temp)
+
+        if dd["hum_pct"].notna().any():
+            png_hum = out_png / f"{prefijo}_{f}_hum.png"
+            grafica_hum_png(dd, f"{f} – Humedad", png_hum)
+            img_hum = Image(str(png_hum))
+            img_hum._restrictSize(170 * mm, 120 * mm)
+            story.append(Spacer(1, 4 * mm))
+            story.append(Paragraph("Gráfico de humedad", styles["Heading3"]))
+            story.append(img_hum)
+
+        if i < len(dias) - 1:
+            story.append(PageBreak())
+
+    if nota_legal.strip():
+        story.append(Spacer(1, 8 * mm))
+        story.append(Paragraph("<b>Nota:</b>", styles["Heading3"]))
+        for linea in nota_legal.splitlines():
+            story.append(Paragraph(linea, styles["Normal"]))
+
+    trabajo.progreso(len(dias), len(dias), "Maquetando PDF")
+    doc.build(story)
+    tmp_path.replace(pdf_path)
+    return pdf_path
+
+
+def grafica_comparativa_png(comp: pd.DataFrame, titulo: str, umbral: float, out_path: Path):
+    fig = Figure()
+    ax = fig.subplots()
+    ax.fill_between(comp.index, comp["temp_min"], comp["temp_max"], alpha=0.3, label="Rango entre estaciones")
+    ax.plot(comp.index, comp["temp_max"], linewidth=0.8, label="Máx. estaciones (°C)")
+    ax.axhline(umbral, linestyle="--", linewidth=1.2, label=f"Umbral {umbral} °C")
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%d/%m"))
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.set_title(titulo)
+    ax.set_ylabel("Temperatura (°C)")
+    fig.tight_layout()
+    ax.legend()
+    fig.savefig(out_path)
+
+
+def generar_pdf_comparativa(
+    trabajo,
+    matriz: pd.DataFrame,
+    umbral: float,
+    intervalo_min: int,
+    nombre_cliente: str = "",
+    out_pdf: Path = OUT_PDF,
+    out_png: Path = OUT_PNG,
+    nota_legal: str = "",
+):
+    """Página resumen de la comparativa entre estaciones (cola de informes)."""
+    if matriz.empty:
+        return None
+    trabajo.progreso(0, 2, "Calculando comparativa")
+    stats = estadisticas_por_estacion(matriz, umbral, intervalo_min)
+    comp = comparativa_temporal(matriz, umbral)
+    resumen = resumen_comparativa(comp)
+
+    d0, d1 = matriz.index.min().date(), matriz.index.max().date()
+    pdf_path = out_pdf / f"comparativa_{d0}_a_{d1}_{_huella(trabajo.clave)}.pdf"
+    tmp_path = pdf_path.with_suffix(".pdf.part")
+    png = out_png / f"{pdf_path.stem}.png"
+
+    doc = SimpleDocTemplate(
+        str(tmp_path),
+        pagesize=A4,
+        leftMargin=18 * mm,
+        rightMargin=18 * mm,
+        topMargin=18 * mm,
+        bottomMargin=18 * mm,
+    )
+    styles = getSampleStyleSheet()
+    story = []
+
+    story.append(Paragraph("Comparativa entre estaciones – PRL-Tech", styles["Title"]))
+    if nombre_cliente:
+        story.append(Paragraph(nombre_cliente, styles["Heading2"]))
+    story.append(Paragraph(f"Rango: {d0} → {d1} – Estaciones: {matriz.shape[1]}", styles["Normal"]))
+    story.append(Paragraph(f"Umbral temperatura: {umbral} °C", styles["Normal"]))
+    story.append(Spacer(1, 6 * mm))
+
+    veces = resumen.get("veces_mas_caliente", {})
+    tabla_data = [["Estación", "Media", "Máx", "Mín", "Cobertura %", "Min ≥ umbral", "Horas más caliente"]]
+    for nombre, fila in stats.iterrows():
+        tabla_data.append([
+            str(nombre),
+            fila["temp_media"],
+            fila["temp_max"],
+            fila["temp_min"],
+            fila["cobertura_pct"],
+            int(fila["minutos_sobre_umbral"]),
+            int(veces.get(nombre, 0)),
+        ])
+    tabla = Table(tabla_data, hAlign="LEFT", repeatRows=1)
+    tabla.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+                ("BOX", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, -1), 8),
+            ]
+        )
+    )
+    story.append(tabla)
+    story.append(Spacer(1, 6 * mm))
+
+    if resumen:
+        story.append(Paragraph(
+            f"Dispersión media entre estaciones: {resumen['dispersion_media']} °C "
+            f"(máx. {resumen['dispersion_max']} °C). "
+            f"Horas con alguna estación ≥ umbral: {resumen['intervalos_con_excedencia']} de {resumen['intervalos']}. "
+            f"Máximo de estaciones ≥ umbral a la vez: {resumen['max_simultaneas_sobre_umbral']}.",
+            styles["Normal"],
+        ))
+        story.append(Spacer(1, 4 * mm))
+
+    trabajo.progreso(1, 2, "Gráfico de dispersión")
+    grafica_comparativa_png(comp, "Rango horario entre estaciones", umbral, png)
+    img = Image(str(png))
+    img._restrictSize(170 * mm, 110 * mm)
+    story.append(img)
+
+    if nota_legal.strip():
+        story.append(Spacer(1, 8 * mm))
+        story.append(Paragraph("<b>Nota:</b>", styles["Heading3"]))
+        for linea in nota_legal.splitlines():
+            story.append(Paragraph(linea, styles["Normal"]))
+
+    trabajo.progreso(2, 2, "Maquetando PDF")
+    doc.build(story)
+    tmp_path.replace(pdf_path)
+    return pdf_path
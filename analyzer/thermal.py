@@ -0,0 +1,67 @@
+# analyzer/thermal.py
+"""
+Métricas térmicas derivadas de temperatura y humedad, calculadas con NumPy
+sobre toda la serie en una sola pasada (justo después de cargar los datos):
+
+- punto_rocio_c: punto de rocío (fórmula de Magnus).
+- indice_calor_c: índice de calor (NOAA / Rothfusz, con sus ajustes).
+- wbgt_c: WBGT aproximado en interior, sin radiación solar (fórmula del
+  Australian Bureau of Meteorology). Es orientativo: ISO 7243 exige medir
+  temperatura de globo y de bulbo húmedo natural.
+
+Donde falta la humedad, las tres columnas quedan a NaN.
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNAS_DERIVADAS = ("punto_rocio_c", "indice_calor_c", "wbgt_c")
+
+
+def punto_rocio(temp_c, hum_pct):
+    a, b = 17.62, 243.12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = np.log(np.clip(hum_pct, 1e-3, 100) / 100.0) + a * temp_c / (b + temp_c)
+        return b * gamma / (a - gamma)
+
+
+def indice_calor(temp_c, hum_pct):
+    t = temp_c * 9.0 / 5.0 + 32.0
+    rh = hum_pct
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+
+    hi = (
+        -42.379 + 2.04901523 * t + 10.14333127 * rh
+        - 0.22475541 * t * rh - 0.00683783 * t * t - 0.05481717 * rh * rh
+        + 0.00122874 * t * t * rh + 0.00085282 * t * rh * rh
+        - 0.00000199 * t * t * rh * rh
+    )
+    with np.errstate(invalid="ignore"):
+        seco = (rh < 13) & (t >= 80) & (t <= 112)
+        hi = hi - np.where(seco, (13 - rh) / 4 * np.sqrt(np.clip(17 - np.abs(t - 95), 0, None) / 17), 0.0)
+        humedo = (rh > 85) & (t >= 80) & (t <= 87)
+        hi = hi + np.where(humedo, (rh - 85) / 10 * (87 - t) / 5, 0.0)
+        hi = np.where((simple + t) / 2 >= 80, hi, simple)
+    return (hi - 32.0) * 5.0 / 9.0
+
+
+def wbgt_interior(temp_c, hum_pct):
+    presion_vapor = hum_pct / 100.0 * 6.105 * np.exp(17.27 * temp_c / (237.7 + temp_c))
+    return 0.567 * temp_c + 0.393 * presion_vapor + 3.94
+
+
+def calcular_metricas_derivadas(df, col_temp="temp_c", col_hum="hum_pct"):
+    """
+    Devuelve `df` con las columnas de COLUMNAS_DERIVADAS añadidas (o
+    recalculadas), vectorizadas sobre toda la serie.
+    """
+    t = pd.to_numeric(df[col_temp], errors="coerce").to_numpy(dtype=float)
+    if col_hum in df.columns:
+        rh = pd.to_numeric(df[col_hum], errors="coerce").to_numpy(dtype=float)
+    else:
+        rh = np.full(len(df), np.nan)
+
+    return df.assign(
+        punto_rocio_c=np.round(punto_rocio(t, rh), 2),
+        indice_calor_c=np.round(indice_calor(t, rh), 2),
+        wbgt_c=np.round(wbgt_interior(t, rh), 2),
+    )
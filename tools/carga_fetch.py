@@ -0,0 +1,144 @@
+# tools/carga_fetch.py
+"""
+Prueba de carga de la ruta de descarga (analyzer.io_thingspeak) contra el
+servidor local de tools/thingspeak_local.py.
+
+Mide throughput (peticiones/s y filas/s), percentiles de latencia y memoria
+para un canal y para una flota de canales descargados en paralelo.
+
+Los tiempos se toman sin tracemalloc (que multiplica el coste de cada
+descarga); la memoria se mide en una segunda pasada aparte. El servidor
+local se arranca en otro proceso para no compartir GIL ni memoria.
+
+Uso:
+    python tools/carga_fetch.py --repeticiones 20 --flota 50 --hilos 8
+    python tools/carga_fetch.py --url http://127.0.0.1:8765   # servidor ya arrancado
+"""
+import argparse
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# --- AÑADIR RAÍZ DEL PROYECTO AL PATH ---
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from analyzer.io_thingspeak import cargar_desde_thingspeak
+from tools.thingspeak_local import arrancar_en_subproceso
+
+
+def _descargar(base_url, channel_id, results):
+    t0 = time.perf_counter()
+    try:
+        df = cargar_desde_thingspeak(
+            channel_id=channel_id,
+            read_api_key="LOCAL",
+            results=results,
+            base_url=base_url,
+        )
+        filas, error = len(df), None
+    except Exception as e:
+        filas, error = 0, type(e).__name__
+    return time.perf_counter() - t0, filas, error
+
+
+def _descargar_todos(base_url, canales, results, hilos):
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        return list(pool.map(lambda c: _descargar(base_url, c, results), canales))
+
+
+def pico_memoria(base_url, canales, results, hilos):
+    """Pico de memoria Python (bytes) de descargar `canales`, con tracemalloc."""
+    tracemalloc.start()
+    try:
+        _descargar_todos(base_url, canales, results, hilos)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pico
+
+
+def medir(base_url, canales, results, hilos):
+    """
+    Descarga cada canal de `canales` con un pool de `hilos` y devuelve un
+    dict con latencias, throughput, errores y pico de memoria Python.
+    La memoria se mide en otra pasada para no falsear los tiempos.
+    """
+    t0 = time.perf_counter()
+    res = _descargar_todos(base_url, canales, results, hilos)
+    total = time.perf_counter() - t0
+    pico = pico_memoria(base_url, canales, results, hilos)
+
+    lat = np.array([r[0] for r in res]) * 1000.0
+    filas = sum(r[1] for r in res)
+    errores = {}
+    for r in res:
+        if r[2]:
+            errores[r[2]] = errores.get(r[2], 0) + 1
+
+    return {
+        "peticiones": len(res),
+        "segundos": round(total, 3),
+        "peticiones_s": round(len(res) / total, 1) if total else None,
+        "filas_s": round(filas / total, 0) if total else None,
+        "p50_ms": round(float(np.percentile(lat, 50)), 1),
+        "p90_ms": round(float(np.percentile(lat, 90)), 1),
+        "p99_ms": round(float(np.percentile(lat, 99)), 1),
+        "pico_mem_mb": round(pico / 1e6, 1),
+        "errores": errores,
+    }
+
+
+def _imprimir(titulo, r):
+    print(f"\n== {titulo}")
+    for k, v in r.items():
+        print(f"  {k:>14}: {v}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Prueba de carga de cargar_desde_thingspeak")
+    ap.add_argument("--url", default=None, help="Servidor ya arrancado; si no, se arranca uno local en otro proceso")
+    ap.add_argument("--results", type=int, default=8000)
+    ap.add_argument("--repeticiones", type=int, default=20, help="Descargas secuenciales de un canal")
+    ap.add_argument("--flota", type=int, default=50, help="Número de canales distintos")
+    ap.add_argument("--hilos", type=int, default=8)
+    ap.add_argument("--dias", type=int, default=60)
+    ap.add_argument("--latencia-ms", type=float, default=0.0)
+    ap.add_argument("--peticiones-por-segundo", type=int, default=0)
+    ap.add_argument("--tasa-error", type=float, default=0.0)
+    args = ap.parse_args()
+
+    servidor = None
+    base_url = args.url
+    if base_url is None:
+        servidor, base_url = arrancar_en_subproceso(
+            dias=args.dias,
+            latencia_ms=args.latencia_ms,
+            peticiones_por_segundo=args.peticiones_por_segundo,
+            tasa_error=args.tasa_error,
+        )
+    print(f"Servidor: {base_url}")
+
+    # Calentamiento (genera y cachea la serie sintética en el servidor)
+    try:
+        _descargar(base_url, 1, args.results)
+
+        _imprimir(
+            f"Un canal x {args.repeticiones} (secuencial)",
+            medir(base_url, [1] * args.repeticiones, args.results, hilos=1),
+        )
+        _imprimir(
+            f"Flota de {args.flota} canales ({args.hilos} hilos)",
+            medir(base_url, list(range(1, args.flota + 1)), args.results, hilos=args.hilos),
+        )
+        print(f"\nRSS máximo del proceso: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+    finally:
+        if servidor is not None:
+            servidor.terminate()
+            servidor.wait()
@@ -0,0 +1,110 @@
+# tools/import_budget.py
+"""
+Control del tiempo de importación en frío de cada punto de entrada.
+
+Ejecuta `python -X importtime` en un proceso limpio por punto de entrada,
+suma el tiempo acumulado de los módulos de primer nivel y comprueba:
+- que no supera el presupuesto (ms) del punto de entrada;
+- que no se importa ninguno de los módulos pesados prohibidos
+  (matplotlib, reportlab, plotly), que solo deben cargarse en su etapa.
+
+La UI de Streamlit no se puede importar sin ejecutarla, así que se miden
+los imports de nivel superior de ui/streamlit_app.py (leídos con ast). Como
+Streamlit ya carga parte de plotly por su cuenta, en la UI solo cuentan los
+módulos pesados que no importa `streamlit` por sí solo.
+
+Uso:
+    python tools/import_budget.py            # sale con código 1 si algo falla
+    python tools/import_budget.py --factor 2 # presupuestos x2 (máquinas lentas)
+"""
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+PESADOS = ("matplotlib", "reportlab", "plotly")
+
+# Presupuestos en ms (medidos con margen en un portátil normal)
+PRESUPUESTOS = {
+    "main": 1000,
+    "analyzer.ingest": 1000,
+    "analyzer.report_html": 1000,
+    "ui/streamlit_app.py": 2200,
+}
+
+# Imports de referencia cuyos módulos pesados no se atribuyen al punto de entrada
+BASES = {
+    "ui/streamlit_app.py": "import streamlit",
+}
+
+
+def imports_de_nivel_superior(ruta):
+    """Sentencias import del módulo (sin entrar en funciones ni ramas)."""
+    arbol = ast.parse(Path(ruta).read_text(encoding="utf-8"))
+    lineas = []
+    for nodo in arbol.body:
+        if isinstance(nodo, ast.Import):
+            lineas.extend(f"import {a.name}" for a in nodo.names)
+        elif isinstance(nodo, ast.ImportFrom) and nodo.module and not nodo.level:
+            lineas.append(f"import {nodo.module}")
+    return lineas
+
+
+def medir(codigo):
+    """
+    Ejecuta `codigo` con -X importtime y devuelve (ms_total, módulos importados).
+    El total es la suma del tiempo acumulado de los imports de primer nivel.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "error")
+
+    total_us = 0
+    modulos = set()
+    for linea in proc.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        modulos.add(nombre.strip())
+        # Los imports de primer nivel van con un solo espacio de sangría
+        if nombre.startswith(" ") and not nombre.startswith("  "):
+            total_us += int(acumulado)
+    return total_us / 1000.0, modulos
+
+
+def codigo_de(entrada):
+    if entrada.endswith(".py"):
+        return "\n".join(imports_de_nivel_superior(ROOT_DIR / entrada))
+    return f"import {entrada}"
+
+
+def comprobar(factor=1.0):
+    fallos = []
+    for entrada, presupuesto in PRESUPUESTOS.items():
+        ms, modulos = medir(codigo_de(entrada))
+        if entrada in BASES:
+            modulos -= medir(BASES[entrada])[1]
+        pesados = sorted(m for m in modulos if m.split(".")[0] in PESADOS)
+        limite = presupuesto * factor
+        estado = "OK" if ms <= limite and not pesados else "FALLO"
+        print(f"{estado:>5}  {entrada:<24} {ms:8.1f} ms  (presupuesto {limite:.0f} ms)")
+        if pesados:
+            print(f"       importa módulos pesados: {', '.join(pesados)}")
+        if estado != "OK":
+            fallos.append(entrada)
+    return fallos
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Presupuesto de tiempo de importación por punto de entrada")
+    ap.add_argument("--factor", type=float, default=1.0, help="Multiplica todos los presupuestos")
+    args = ap.parse_args()
+    sys.exit(1 if comprobar(args.factor) else 0)
@@ -0,0 +1,247 @@
+# tools/thingspeak_local.py
+"""
+Servidor HTTP local que imita la API de lectura de ThingSpeak.
+
+Sirve /channels/<id>/feeds.json y /channels/<id>/feeds.csv con datos
+sintéticos (temperatura en field1, humedad en field2) generados a partir
+del id de canal, de forma que cada canal es reproducible.
+
+Respeta `results`, `start`/`end` y el límite de 8000 filas por petición.
+Permite inyectar latencia, limitación de peticiones (429) y errores (500).
+
+Uso:
+    python tools/thingspeak_local.py --port 8765 --dias 14 --latencia-ms 50
+    # y en el cliente:
+    cargar_desde_thingspeak(..., base_url="http://127.0.0.1:8765")
+"""
+import argparse
+import json
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+MAX_FILAS = 8000
+RUTA_FEEDS = re.compile(r"^/channels/(\d+)/feeds\.(json|csv)$")
+
+
+@lru_cache(maxsize=256)
+def canal_sintetico(channel_id, dias=14, intervalo_min=10, fin="2024-07-15"):
+    """
+    Serie sintética de un canal: ciclo diario de temperatura y humedad con
+    ruido. Devuelve (timestamps datetime64[s], temp, hum) como arrays NumPy.
+    """
+    rng = np.random.default_rng(int(channel_id))
+    n = int(dias * 24 * 60 // intervalo_min)
+    ts = pd.date_range(end=pd.Timestamp(fin), periods=n, freq=f"{intervalo_min}min").to_numpy("datetime64[s]")
+
+    horas = (ts - ts.astype("datetime64[D]")).astype(float) / 3600.0
+    base = 24 + rng.uniform(-3, 3)
+    temp = base + 6 * np.sin((horas - 9) / 24 * 2 * np.pi) + rng.normal(0, 0.4, n)
+    hum = 55 - 15 * np.sin((horas - 9) / 24 * 2 * np.pi) + rng.normal(0, 2, n)
+    return ts, np.round(temp, 2), np.round(np.clip(hum, 0, 100), 1)
+
+
+def _parse_fecha(valor):
+    if not valor:
+        return None
+    return np.datetime64(pd.Timestamp(valor).tz_localize(None), "s")
+
+
+def seleccionar(channel_id, params, dias, intervalo_min):
+    """Aplica start/end, results y el tope de 8000 filas (se quedan las últimas)."""
+    ts, temp, hum = canal_sintetico(channel_id, dias, intervalo_min)
+    ini = _parse_fecha(params.get("start"))
+    fin = _parse_fecha(params.get("end"))
+    i0 = 0 if ini is None else int(np.searchsorted(ts, ini, side="left"))
+    i1 = len(ts) if fin is None else int(np.searchsorted(ts, fin, side="right"))
+
+    results = params.get("results")
+    limite = MAX_FILAS if results is None else min(int(results), MAX_FILAS)
+    i0 = max(i0, i1 - limite)
+    return i0, ts[i0:i1], temp[i0:i1], hum[i0:i1]
+
+
+def feeds_json(channel_id, i0, ts, temp, hum):
+    created = np.datetime_as_string(ts, unit="s")
+    feeds = [
+        {"created_at": f"{c}Z", "entry_id": i0 + k + 1, "field1": f"{t}", "field2": f"{h}"}
+        for k, (c, t, h) in enumerate(zip(created, temp.tolist(), hum.tolist()))
+    ]
+    canal = {
+        "id": int(channel_id),
+        "name": f"Canal sintético {channel_id}",
+        "field1": "Temperatura",
+        "field2": "Humedad",
+        "last_entry_id": i0 + len(ts),
+    }
+    return json.dumps({"channel": canal, "feeds": feeds}).encode("utf-8")
+
+
+def feeds_csv(i0, ts, temp, hum):
+    created = np.datetime_as_string(ts, unit="s")
+    lineas = ["created_at,entry_id,field1,field2"]
+    lineas += [
+        f"{c.replace('T', ' ')} UTC,{i0 + k + 1},{t},{h}"
+        for k, (c, t, h) in enumerate(zip(created, temp.tolist(), hum.tolist()))
+    ]
+    return ("\n".join(lineas) + "\n").encode("utf-8")
+
+
+class LimitadorPeticiones:
+    """Ventana deslizante de 1 s por cliente; 0 desactiva el límite."""
+
+    def __init__(self, por_segundo):
+        self.por_segundo = por_segundo
+        self._marcas = {}
+        self._lock = threading.Lock()
+
+    def permitir(self, cliente):
+        if not self.por_segundo:
+            return True
+        ahora = time.monotonic()
+        with self._lock:
+            marcas = [m for m in self._marcas.get(cliente, []) if ahora - m < 1.0]
+            permitido = len(marcas) < self.por_segundo
+            if permitido:
+                marcas.append(ahora)
+            self._marcas[cliente] = marcas
+        return permitido
+
+
+class ManejadorThingSpeak(BaseHTTPRequestHandler):
+    # Configuración inyectada por crear_servidor()
+    dias = 14
+    intervalo_min = 10
+    latencia_ms = 0.0
+    tasa_error = 0.0
+    limitador = LimitadorPeticiones(0)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        m = RUTA_FEEDS.match(url.path)
+        if not m:
+            return self._responder(404, b'"-1"', "application/json")
+
+        if self.latencia_ms:
+            time.sleep(self.latencia_ms / 1000.0)
+        if not self.limitador.permitir(self.client_address[0]):
+            return self._responder(429, b'{"status": "429", "error": "Rate limit"}', "application/json")
+        if self.tasa_error and random.random() < self.tasa_error:
+            return self._responder(500, b'{"status": "500", "error": "Injected error"}', "application/json")
+
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        channel_id, formato = int(m.group(1)), m.group(2)
+        try:
+            i0, ts, temp, hum = seleccionar(channel_id, params, self.dias, self.intervalo_min)
+        except (ValueError, TypeError):
+            return self._responder(400, b'"-1"', "application/json")
+
+        if formato == "json":
+            self._responder(200, feeds_json(channel_id, i0, ts, temp, hum), "application/json")
+        else:
+            self._responder(200, feeds_csv(i0, ts, temp, hum), "text/csv")
+
+    def _responder(self, codigo, cuerpo, tipo):
+        self.send_response(codigo)
+        self.send_header("Content-Type", f"{tipo}; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, format, *args):
+        # Silencioso: el harness de carga genera miles de peticiones
+        pass
+
+
+def crear_servidor(host="127.0.0.1", port=0, dias=14, intervalo_min=10,
+                   latencia_ms=0.0, peticiones_por_segundo=0, tasa_error=0.0):
+    """
+    Crea (sin arrancar) un ThreadingHTTPServer con la configuración dada.
+    port=0 elige un puerto libre; consulta `servidor.server_address`.
+    """
+    manejador = type(
+        "ManejadorConfigurado",
+        (ManejadorThingSpeak,),
+        {
+            "dias": dias,
+            "intervalo_min": intervalo_min,
+            "latencia_ms": float(latencia_ms),
+            "tasa_error": float(tasa_error),
+            "limitador": LimitadorPeticiones(int(peticiones_por_segundo)),
+        },
+    )
+    servidor = ThreadingHTTPServer((host, port), manejador)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def arrancar_en_hilo(**kwargs):
+    """Arranca el servidor en un hilo daemon y devuelve (servidor, base_url)."""
+    servidor = crear_servidor(**kwargs)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    host, port = servidor.server_address[:2]
+    return servidor, f"http://{host}:{port}"
+
+
+def arrancar_en_subproceso(dias=14, intervalo_min=10, latencia_ms=0.0, peticiones_por_segundo=0,
+                           tasa_error=0.0):
+    """
+    Arranca el servidor en otro proceso (puerto libre) y devuelve
+    (proceso, base_url). Así no comparte GIL ni memoria con quien lo mide.
+    Hay que pararlo con `proceso.terminate()`.
+    """
+    proceso = subprocess.Popen(
+        [
+            sys.executable, __file__, "--port", "0",
+            "--dias", str(dias),
+            "--intervalo-min", str(intervalo_min),
+            "--latencia-ms", str(latencia_ms),
+            "--peticiones-por-segundo", str(peticiones_por_segundo),
+            "--tasa-error", str(tasa_error),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    linea = proceso.stdout.readline()
+    if "http://" not in linea:
+        proceso.terminate()
+        raise RuntimeError("No se pudo arrancar el servidor ThingSpeak local")
+    return proceso, linea[linea.index("http://"):].strip()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Servidor local que imita la API de ThingSpeak")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765, help="0 = puerto libre")
+    ap.add_argument("--dias", type=int, default=14)
+    ap.add_argument("--intervalo-min", type=int, default=10)
+    ap.add_argument("--latencia-ms", type=float, default=0.0)
+    ap.add_argument("--peticiones-por-segundo", type=int, default=0, help="0 = sin límite")
+    ap.add_argument("--tasa-error", type=float, default=0.0, help="Probabilidad de responder 500")
+    args = ap.parse_args()
+
+    srv = crear_servidor(
+        host=args.host,
+        port=args.port,
+        dias=args.dias,
+        intervalo_min=args.intervalo_min,
+        latencia_ms=args.latencia_ms,
+        peticiones_por_segundo=args.peticiones_por_segundo,
+        tasa_error=args.tasa_error,
+    )
+    host, port = srv.server_address[:2]
+    print(f"Sirviendo ThingSpeak local en http://{host}:{port}", flush=True)
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
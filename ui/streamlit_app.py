@@ -2,38 +2,31 @@ from pathlib import Path
 import sys
 import streamlit as st
 import pandas as pd
-import numpy as np
+import uuid
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 
 # --- AÑADIR RAÍZ DEL PROYECTO AL PATH ---
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-# Interactivo
-import plotly.express as px
-
-# Estático para PDF
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-
-# PDF
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Paragraph,
-    Spacer,
-    Image,
-    Table,
-    TableStyle,
-    PageBreak,
-)
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-from reportlab.lib.units import mm
+# Plotly, matplotlib y ReportLab se importan solo donde se usan
+# (gráficos interactivos / analyzer.report_pdf) para acelerar el arranque.
 
 # Lectura desde ThingSpeak
 from analyzer.io_thingspeak import cargar_desde_thingspeak
+from analyzer.jobs import ColaTrabajos
+from analyzer.merge import fusionar_ordenado
+from analyzer.daily import resultados_por_dia
+from analyzer.report_html import html_informe
+from analyzer.thermal import calcular_metricas_derivadas
+from analyzer.compare import (
+    alinear_estaciones,
+    estadisticas_por_estacion,
+    comparativa_temporal,
+    resumen_comparativa,
+)
 
 
 # ---------------------------
@@ -62,223 +55,107 @@ else:
 # ---------------------------
 # Funciones utilitarias
 # ---------------------------
-def franja_mas_caliente(df: pd.DataFrame, ventana_horas: int = 2):
-    if df.empty:
-        return None
-    ds = df.set_index("timestamp").sort_index()
-    roll = ds["temp_c"].rolling(f"{ventana_horas}h").mean()
-    idxmax = roll.idxmax()
-    if pd.isna(idxmax):
-        return None
-    t_fin = idxmax
-    t_ini = t_fin - pd.Timedelta(hours=ventana_horas)
-    return {
-        "inicio": t_ini,
-        "fin": t_fin,
-        "temp_media_franja": round(float(roll.loc[idxmax]), 1),
-    }
-
-
-def intervalos_sobre_umbral(df: pd.DataFrame, umbral: float):
-    if df.empty:
-        return []
-    d = df.sort_values("timestamp").reset_index(drop=True).copy()
-    s = d["temp_c"] >= float(umbral)
-    starts = d.loc[s & ~s.shift(fill_value=False), "timestamp"].reset_index(drop=True)
-    ends = d.loc[~s & s.shift(fill_value=False), "timestamp"].reset_index(drop=True)
-    if len(ends) < len(starts):
-        ends = pd.concat([ends, pd.Series([d["timestamp"].iloc[-1]])], ignore_index=True)
-    return list(zip(starts.tolist(), ends.tolist()))
-
-
-def grafica_temp_png(df: pd.DataFrame, titulo: str, umbral: float, out_path: Path):
-    plt.figure()
-    plt.plot(df["timestamp"], df["temp_c"], label="Temperatura (°C)")
-    if umbral is not None:
-        plt.axhline(umbral, linestyle="--", linewidth=1.2, label=f"Umbral {umbral} °C")
-        y2 = df["temp_c"].to_numpy(dtype=float)
-        plt.fill_between(df["timestamp"], y2, umbral, where=y2 >= umbral, alpha=0.25)
-    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
-    plt.xticks(rotation=45)
-    plt.title(titulo)
-    plt.xlabel("Hora del día")
-    plt.ylabel("Temperatura (°C)")
-    plt.tight_layout()
-    plt.legend()
-    plt.savefig(out_path)
-    plt.close()
-
-
-def grafica_hum_png(df: pd.DataFrame, titulo: str, out_path: Path):
-    if not df["hum_pct"].notna().any():
-        return None
-    plt.figure()
-    plt.plot(df["timestamp"], df["hum_pct"], label="Humedad (%)")
-    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter("%H:%M"))
-    plt.xticks(rotation=45)
-    plt.title(titulo)
-    plt.xlabel("Hora del día")
-    plt.ylabel("Humedad (%)")
-    plt.tight_layout()
-    plt.legend()
-    plt.savefig(out_path)
-    plt.close()
-    return out_path
-
-
-def resumen_basico(df: pd.DataFrame):
-    return {
-        "n": int(len(df)),
-        "temp_media": round(float(df["temp_c"].mean()), 1) if len(df) else None,
-        "temp_max": round(float(df["temp_c"].max()), 1) if len(df) else None,
-        "temp_min": round(float(df["temp_c"].min()), 1) if len(df) else None,
-        "hum_media": round(float(df["hum_pct"].mean()), 1) if df["hum_pct"].notna().any() else None,
-    }
-
-
-def generar_pdf(
-    df: pd.DataFrame,
-    fecha_ini,
-    fecha_fin,
-    umbral: float,
-    ventana_horas: int,
-    nombre_cliente: str = "",
-):
-    d0 = pd.to_datetime(fecha_ini)
-    d1 = pd.to_datetime(fecha_fin)
-    df["fecha"] = df["timestamp"].dt.date
-    mask = (df["fecha"] >= d0.date()) & (df["fecha"] <= d1.date())
-    dsub = df.loc[mask].copy()
-    if dsub.empty:
-        st.warning("No hay datos en el rango seleccionado.")
-        return None
-
-    pdf_name = f"informe_{d0.date()}_a_{d1.date()}.pdf"
-    pdf_path = OUT_PDF / pdf_name
-
-    doc = SimpleDocTemplate(
-        str(pdf_path),
-        pagesize=A4,
-        leftMargin=18 * mm,
-        rightMargin=18 * mm,
-        topMargin=18 * mm,
-        bottomMargin=18 * mm,
+def generar_pdf(trabajo, *args, **kwargs):
+    # ReportLab y matplotlib solo se importan cuando un trabajo construye un PDF
+    from analyzer.report_pdf import generar_pdf as _generar_pdf
+
+    return _generar_pdf(trabajo, *args, out_pdf=OUT_PDF, out_png=OUT_PNG, nota_legal=NOTA_LEGAL, **kwargs)
+
+
+def generar_pdf_comparativa(trabajo, *args, **kwargs):
+    from analyzer.report_pdf import generar_pdf_comparativa as _generar_pdf_comparativa
+
+    return _generar_pdf_comparativa(
+        trabajo, *args, out_pdf=OUT_PDF, out_png=OUT_PNG, nota_legal=NOTA_LEGAL, **kwargs
     )
-    styles = getSampleStyleSheet()
-    story = []
-
-    story.append(Paragraph("Informe térmico orientativo – PRL-Tech", styles["Title"]))
-    if nombre_cliente:
-        story.append(Paragraph(nombre_cliente, styles["Heading2"]))
-    story.append(Paragraph(f"Rango: {d0.date()} → {d1.date()}", styles["Normal"]))
-    story.append(Paragraph(f"Umbral temperatura: {umbral} °C – Ventana franja: {ventana_horas} h", styles["Normal"]))
-    story.append(Spacer(1, 10 * mm))
-
-    fechas = sorted(dsub["fecha"].unique())
-    for i, f in enumerate(fechas):
-        dd = dsub[dsub["fecha"] == f].copy()
-
-        res = resumen_basico(dd)
-        franja = franja_mas_caliente(dd, ventana_horas=ventana_horas)
-        tramos = intervalos_sobre_umbral(dd, umbral)
-
-        tabla_data = [
-            ["Día", str(f)],
-            ["Registros", res["n"]],
-            ["Temp. media (°C)", res["temp_media"]],
-            ["Temp. máx (°C)", res["temp_max"]],
-            ["Temp. mín (°C)", res["temp_min"]],
-        ]
-        if res["hum_media"] is not None:
-            tabla_data.append(["Humedad media (%)", res["hum_media"]])
-
-        if franja:
-            tabla_data.append(
-                [
-                    "Franja más calurosa",
-                    f"{franja['inicio'].strftime('%H:%M')} → {franja['fin'].strftime('%H:%M')} "
-                    f"({franja['temp_media_franja']} °C)",
-                ]
-            )
-        else:
-            tabla_data.append(["Franja más calurosa", "No disponible"])
-
-        if tramos:
-            mins = sum(int((fin - ini).total_seconds() / 60) for ini, fin in tramos)
-
-            if len(dd) > 1:
-                diffs = (
-                    dd.sort_values("timestamp")["timestamp"]
-                    .diff()
-                    .dt.total_seconds()
-                    .dropna()
-                    / 60.0
-                )
-                if not diffs.empty:
-                    step = int(round(diffs.median()))
-                else:
-                    step = 10
-            else:
-                step = 10
 
-            total_mins = len(dd) * step
-            pct = round(100 * mins / total_mins, 1) if total_mins else 0.0
 
-            tabla_data.append(
-                [
-                    f"Tramos ≥ {umbral} °C",
-                    ", ".join(f"{ini.strftime('%H:%M')}–{fin.strftime('%H:%M')}" for ini, fin in tramos),
-                ]
-            )
-            tabla_data.append(["% del día ≥ umbral", f"{pct}%"])
-        else:
-            tabla_data.append([f"Tramos ≥ {umbral} °C", "Ninguno"])
-
-        tabla = Table(tabla_data, hAlign="LEFT", colWidths=[60 * mm, 105 * mm])
-        tabla.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                    ("BOX", (0, 0), (-1, -1), 0.5, colors.grey),
-                    ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ]
+@st.fragment(run_every=1)
+def progreso_trabajo(cola, clave):
+    """
+    Progreso y cancelación de un trabajo en curso. Solo este fragmento se
+    refresca cada segundo; al terminar el trabajo se vuelve a ejecutar la
+    página entera para mostrar el resultado.
+    """
+    trabajo = cola.obtener(clave)
+    if trabajo is None or not trabajo.activo:
+        st.rerun()
+    st.progress(trabajo.fraccion, text=trabajo.detalle or "En cola…")
+    if SESION in trabajo.sesiones and st.button("Cancelar informe"):
+        cola.cancelar(clave, SESION)
+        st.session_state.informes_cancelados.add(clave)
+        st.rerun()
+
+
+def mostrar_trabajo(cola, trabajo, etiqueta="PDF"):
+    """Progreso, cancelación y descarga de un trabajo de la cola de informes."""
+    if trabajo is None:
+        return
+    if trabajo.activo and trabajo.clave in st.session_state.informes_cancelados:
+        # Otra sesión sigue esperando el mismo informe: solo se cancela para esta
+        st.info("Informe cancelado.")
+    elif trabajo.activo:
+        progreso_trabajo(cola, trabajo.clave)
+    elif trabajo.estado == "terminado":
+        pdf_path = trabajo.resultado
+        if pdf_path is None:
+            st.warning("No hay datos en el rango seleccionado.")
+        elif Path(pdf_path).exists():
+            st.success(f"✅ Informe generado: {pdf_path}")
+            st.download_button(
+                label=f"⬇️ Descargar {etiqueta}",
+                data=Path(pdf_path).read_bytes(),
+                file_name=Path(pdf_path).name,
+                mime="application/pdf",
             )
-        )
+    elif trabajo.estado == "cancelado":
+        st.info("Informe cancelado.")
+    elif trabajo.estado == "error":
+        st.error(f"Error generando el informe: {trabajo.error}")
+
+
+def borrar_informe(trabajo):
+    """Borra el PDF de un trabajo descartado de la caché y sus gráficos PNG."""
+    if not trabajo.resultado:
+        return
+    pdf_path = Path(trabajo.resultado)
+    pdf_path.unlink(missing_ok=True)
+    for png in OUT_PNG.glob(f"{pdf_path.stem}*.png"):
+        png.unlink(missing_ok=True)
+
+
+@st.cache_resource
+def cola_informes():
+    """Cola compartida por todas las sesiones del servidor."""
+    caducidad_min = CFG.get("informes_caducidad_min", 120)
+    return ColaTrabajos(
+        max_workers=int(CFG.get("informes_workers", 2)),
+        max_trabajos=int(CFG.get("informes_max", 32)),
+        caducidad_s=60 * float(caducidad_min) if caducidad_min is not None else None,
+        al_descartar=borrar_informe,
+    )
 
-        png_temp = OUT_PNG / f"{f}_temp.png"
-        grafica_temp_png(dd, f"{f} – Temperatura", umbral, png_temp)
-        img_temp = Image(str(png_temp))
-        img_temp._restrictSize(170 * mm, 120 * mm)
 
-        story.append(Paragraph(f"Día {f}", styles["Heading2"]))
-        story.append(Spacer(1, 4 * mm))
-        story.append(tabla)
-        story.append(Spacer(1, 6 * mm))
-        story.append(Paragraph("Gráfico de temperatura", styles["Heading3"]))
-        story.append(img_temp)
+def pdf_disponible(pdf_path):
+    return pdf_path is None or Path(pdf_path).exists()
 
-        if dd["hum_pct"].notna().any():
-            png_hum = OUT_PNG / f"{f}_hum.png"
-            grafica_hum_png(dd, f"{f} – Humedad", png_hum)
-            img_hum = Image(str(png_hum))
-            img_hum._restrictSize(170 * mm, 120 * mm)
-            story.append(Spacer(1, 4 * mm))
-            story.append(Paragraph("Gráfico de humedad", styles["Heading3"]))
-            story.append(img_hum)
 
-        if i < len(fechas) - 1:
-            story.append(PageBreak())
+def version_datos(df):
+    """Nº de filas y última lectura: cambia al recargar datos nuevos del sensor."""
+    if df is None or df.empty:
+        return (0, None, None)
+    ultimo_id = df["entry_id"].max() if "entry_id" in df.columns else None
+    return (
+        len(df),
+        str(df["timestamp"].max()),
+        None if pd.isna(ultimo_id) else int(ultimo_id),
+    )
 
-    if NOTA_LEGAL.strip():
-        story.append(Spacer(1, 8 * mm))
-        story.append(Paragraph("<b>Nota:</b>", styles["Heading3"]))
-        for linea in NOTA_LEGAL.splitlines():
-            story.append(Paragraph(linea, styles["Normal"]))
 
-    doc.build(story)
-    return pdf_path
+def pedir_informe(cola, clave, fn, *args, **kwargs):
+    """Encola el informe para esta sesión (y anula una cancelación previa)."""
+    st.session_state.informes_cancelados.discard(clave)
+    return cola.enviar(clave, fn, *args, sesion=SESION, **kwargs)
 
 
 # ---------------------------
@@ -309,11 +186,32 @@ if not channel_id or not READ_API_KEY:
     st.error("THINGSPEAK_READ_API_KEY o THINGSPEAK_CHANNEL_ID están vacíos en secrets.toml.")
     st.stop()
 
+# Sensores disponibles: el principal y, opcionalmente, una tabla [SENSORES]
+# en secrets.toml con channel_id / read_api_key por nombre visible.
+SENSORES = {"Sensor de mi casa": {"channel_id": channel_id, "read_api_key": READ_API_KEY}}
+try:
+    for nombre, datos in st.secrets.get("SENSORES", {}).items():
+        SENSORES[str(nombre)] = {
+            "channel_id": str(datos["channel_id"]).strip(),
+            "read_api_key": datos.get("read_api_key", READ_API_KEY),
+        }
+except Exception:
+    st.sidebar.warning("La tabla SENSORES de secrets.toml no es válida; se ignora.")
+
+modo = st.sidebar.radio("Modo", ["Un sensor", "Comparar sensores"], horizontal=True)
+
 # Selector visible (no muestra ID ni API)
-opcion = st.sidebar.selectbox(
-    "Selecciona sensor",
-    ["Sensor de mi casa"],
-)
+if modo == "Un sensor":
+    opcion = st.sidebar.selectbox(
+        "Selecciona sensor",
+        list(SENSORES.keys()),
+    )
+else:
+    seleccion = st.sidebar.multiselect(
+        "Sensores a comparar",
+        list(SENSORES.keys()),
+        default=list(SENSORES.keys()),
+    )
 
 st.sidebar.markdown("### Ajustes de descarga")
 results = st.sidebar.number_input(
@@ -324,18 +222,44 @@ results = st.sidebar.number_input(
     step=100,
 )
 
+
+def cargar_sensor(nombre):
+    datos = SENSORES[nombre]
+    return cargar_desde_thingspeak(
+        channel_id=int(datos["channel_id"]),
+        read_api_key=datos["read_api_key"],
+        field_temp=field_temp,
+        field_hum=field_hum,
+        results=int(results),
+    )
+
+
 if "df" not in st.session_state:
     st.session_state.df = None
-
-if st.sidebar.button("📡 Cargar datos desde ThingSpeak"):
+    st.session_state.sensor = None
+if "estaciones" not in st.session_state:
+    st.session_state.estaciones = {}
+if "sesion_id" not in st.session_state:
+    st.session_state.sesion_id = uuid.uuid4().hex
+    st.session_state.informes_cancelados = set()
+SESION = st.session_state.sesion_id
+
+if modo == "Comparar sensores":
+    if st.sidebar.button("📡 Cargar sensores desde ThingSpeak"):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futuros = {n: pool.submit(cargar_sensor, n) for n in seleccion}
+        estaciones = {}
+        for nombre, fut in futuros.items():
+            try:
+                estaciones[nombre] = fut.result()
+            except Exception as e:
+                st.error(f"Error consultando ThingSpeak ({nombre}): {e}")
+        st.session_state.estaciones = estaciones
+        st.success(f"Sensores cargados: {sum(not d.empty for d in estaciones.values())}.")
+
+elif st.sidebar.button("📡 Cargar datos desde ThingSpeak"):
     try:
-        df = cargar_desde_thingspeak(
-            channel_id=int(channel_id),
-            read_api_key=READ_API_KEY,
-            field_temp=field_temp,
-            field_hum=field_hum,
-            results=int(results),
-        )
+        df = cargar_sensor(opcion)
     except Exception as e:
         st.error(f"Error consultando ThingSpeak: {e}")
         df = None
@@ -343,9 +267,77 @@ if st.sidebar.button("📡 Cargar datos desde ThingSpeak"):
         if df is None or df.empty:
             st.warning("ThingSpeak no ha devuelto datos.")
         else:
+            # Descargas repetidas del mismo sensor amplían el histórico sin duplicar lecturas
+            previo = st.session_state.df
+            if previo is not None and st.session_state.sensor == opcion:
+                df = fusionar_ordenado(previo.drop(columns=["fecha"], errors="ignore"), df)
+            # Índice de calor, punto de rocío y WBGT: una sola pasada al cargar
+            df = calcular_metricas_derivadas(df)
             st.session_state.df = df
+            st.session_state.sensor = opcion
             st.success(f"Datos cargados: {len(df)} registros.")
 
+
+# ---------------------------
+# Modo comparativa entre sensores
+# ---------------------------
+if modo == "Comparar sensores":
+    estaciones = {n: d for n, d in st.session_state.estaciones.items() if n in seleccion}
+    if not estaciones:
+        st.info("Selecciona sensores y pulsa 'Cargar sensores desde ThingSpeak'.")
+        st.stop()
+
+    st.subheader("⚙️ Parámetros")
+    c1, c2 = st.columns(2)
+    umbral = c1.number_input("Umbral de temperatura (°C)", value=30.0, step=0.5)
+    rejilla_min = c2.selectbox("Rejilla común (minutos)", [5, 10, 15, 30, 60], index=1)
+
+    matriz = alinear_estaciones(estaciones, freq=f"{rejilla_min}min")
+    if matriz.empty:
+        st.warning("Ningún sensor ha devuelto datos.")
+        st.stop()
+    stats = estadisticas_por_estacion(matriz, umbral, rejilla_min)
+    comp = comparativa_temporal(matriz, umbral)
+    resumen = resumen_comparativa(comp)
+
+    st.subheader(f"📊 Estaciones ({matriz.shape[1]})")
+    stats_tabla = stats.assign(horas_mas_caliente=stats.index.map(resumen["veces_mas_caliente"]).fillna(0).astype(int))
+    st.dataframe(stats_tabla, use_container_width=True)
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Dispersión media (°C)", resumen["dispersion_media"])
+    m2.metric("Máx. estaciones ≥ umbral a la vez", resumen["max_simultaneas_sobre_umbral"])
+    m3.metric("Horas con alguna excedencia", resumen["intervalos_con_excedencia"])
+
+    st.subheader("🌡️ Rango horario entre estaciones")
+    import plotly.express as px
+
+    fig_comp = px.line(comp.reset_index(), x="timestamp", y=["temp_max", "temp_min"])
+    fig_comp.add_hline(y=umbral, line_dash="dash", line_color="red", annotation_text=f"Umbral {umbral} °C")
+    fig_comp.update_layout(hovermode="x unified")
+    st.plotly_chart(fig_comp, use_container_width=True)
+
+    st.subheader("🔥 Estaciones sobre el umbral a la vez")
+    st.bar_chart(comp["estaciones_sobre_umbral"])
+
+    st.subheader("🧾 Informe PDF de la comparativa")
+    cola = cola_informes()
+    clave = ("comparativa", tuple(matriz.columns), str(matriz.index.min()), str(matriz.index.max()),
+             float(umbral), int(rejilla_min), tuple(version_datos(estaciones[n]) for n in matriz.columns))
+    if st.button("Generar resumen PDF"):
+        pedir_informe(
+            cola,
+            clave,
+            generar_pdf_comparativa,
+            matriz,
+            umbral,
+            rejilla_min,
+            nombre_cliente=CFG.get("nombre_cliente", "Mi estación DHT22"),
+            valido=pdf_disponible,
+        )
+    mostrar_trabajo(cola, cola.obtener(clave))
+    st.stop()
+
 df = st.session_state.df
 
 # ---------------------------
@@ -364,6 +356,14 @@ if df is not None and not df.empty:
 
     st.subheader("⚙️ Parámetros")
     umbral = st.number_input("Umbral de temperatura (°C)", value=30.0, step=0.5)
+    # `umbral_wbgt: null` en settings.yaml (o el campo vacío) desactiva el umbral WBGT
+    umbral_wbgt_cfg = CFG.get("umbral_wbgt", 28)
+    umbral_wbgt = st.number_input(
+        "Umbral WBGT aproximado (°C)",
+        value=float(umbral_wbgt_cfg) if umbral_wbgt_cfg is not None else None,
+        step=0.5,
+        placeholder="Sin umbral WBGT",
+    )
     ventana = st.slider("Franja más calurosa (horas)", min_value=1, max_value=4, value=2)
 
     st.subheader("👀 Vista previa rápida")
@@ -374,6 +374,8 @@ if df is not None and not df.empty:
     day_end = day_start + pd.Timedelta(hours=23, minutes=59)
 
     st.subheader(f"🌡️ Temperatura – {dia_preview}")
+    import plotly.express as px
+
     fig_temp = px.line(dprev, x="timestamp", y="temp_c", title=f"Temperatura del {dia_preview}")
     fig_temp.add_hline(y=umbral, line_dash="dash", line_color="red", annotation_text=f"Umbral {umbral} °C")
     fig_temp.update_traces(
@@ -395,27 +397,68 @@ if df is not None and not df.empty:
     else:
         st.info("Este día no tiene datos de humedad.")
 
+    st.subheader("⚡ Vista previa del informe (HTML)")
+    if st.button("Generar vista previa"):
+        if fecha_fin < fecha_ini:
+            st.error("La fecha final no puede ser anterior a la inicial.")
+        else:
+            mask = (df["fecha"] >= fecha_ini) & (df["fecha"] <= fecha_fin)
+            dias = resultados_por_dia(
+                df.loc[mask], "timestamp", "temp_c", "hum_pct", umbral, ventana, umbral_wbgt=umbral_wbgt
+            )
+            if not dias:
+                st.warning("No hay datos en el rango seleccionado.")
+            else:
+                html_prev = html_informe(
+                    dias,
+                    "timestamp",
+                    "temp_c",
+                    "hum_pct",
+                    umbral,
+                    ventana,
+                    titulo="Informe térmico orientativo – PRL-Tech",
+                    cliente=CFG.get("nombre_cliente", "Mi estación DHT22"),
+                    nota_legal=NOTA_LEGAL,
+                    umbral_wbgt=umbral_wbgt,
+                )
+                import streamlit.components.v1 as components
+
+                components.html(html_prev, height=600, scrolling=True)
+                st.download_button(
+                    label="⬇️ Descargar HTML",
+                    data=html_prev.encode("utf-8"),
+                    file_name=f"informe_{fecha_ini}_a_{fecha_fin}.html",
+                    mime="text/html",
+                )
+
     st.subheader("🧾 Generar informe PDF")
+    cola = cola_informes()
+    # Canal del que vienen los datos cargados (no el del selector, que puede
+    # haber cambiado sin recargar)
+    sensor_df = st.session_state.sensor
+    clave = (
+        SENSORES.get(sensor_df, {}).get("channel_id", sensor_df), str(fecha_ini), str(fecha_fin), float(umbral), int(ventana),
+        umbral_wbgt, version_datos(df),
+    )
+
     if st.button("Generar informe"):
         if fecha_fin < fecha_ini:
             st.error("La fecha final no puede ser anterior a la inicial.")
         else:
-            pdf_path = generar_pdf(
-                df,
+            pedir_informe(
+                cola,
+                clave,
+                generar_pdf,
+                df.drop(columns=["fecha"]),
                 fecha_ini,
                 fecha_fin,
                 umbral,
                 ventana,
                 nombre_cliente=CFG.get("nombre_cliente", "Mi estación DHT22"),
+                umbral_wbgt=umbral_wbgt,
+                valido=pdf_disponible,
             )
-            if pdf_path:
-                st.success(f"✅ Informe generado: {pdf_path}")
-                with open(pdf_path, "rb") as f:
-                    st.download_button(
-                        label="⬇️ Descargar PDF",
-                        data=f.read(),
-                        file_name=pdf_path.name,
-                        mime="application/pdf",
-                    )
+
+    mostrar_trabajo(cola, cola.obtener(clave))
 else:
     st.info("Pulsa en la barra lateral el botón 'Cargar datos desde ThingSpeak'.")